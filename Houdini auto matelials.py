@@ -1,15 +1,80 @@
 import hou
 import os
+import contextlib
 import re
 import voptoolutils
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from PySide2 import QtWidgets, QtCore, QtGui
+import shiboken2
 from pxr import Usd
 
 TEXTURE_TYPES = [
     "base_color", "specular_roughness", "metalness",
     "normal", "transmission", "opacity", "displacement"
 ]
+_TEX_TYPE_LOWER = {t: t.lower() for t in TEXTURE_TYPES}
 TEX_ROOT_DIR = os.path.join(hou.text.expandString("$JOB"), "tex").replace("\\", "/")
+_MTLX_IMAGE_TYPE = hou.nodeType(hou.vopNodeTypeCategory(), "mtlximage")
+_MTLX_TAB_MASK = voptoolutils.MTLX_TAB_MASK
+_TEXTURE_SIGNATURES = {"base_color": "color3", "specular_roughness": "float", "metalness": "float", "normal": "vector3", "transmission": "float", "opacity": "float", "displacement": "float"}
+_SURFACE_INPUT_NAMES = tuple(TEXTURE_TYPES) + ("displacementshader",)
+_SECONDARY_INPUTS = tuple(t for t in TEXTURE_TYPES if t not in ("normal", "displacement", "opacity"))
+
+_UDIM_RE = re.compile(r'(.+?)[._](\d{4})\.(.+)$', re.IGNORECASE)
+_TRAILING_DIGITS_RE = re.compile(r'(\d+)$')
+_UDIM_TAG_RE = re.compile(r'[_.]<UDIM>')
+_UDIM_4DIGIT_TAIL_RE = re.compile(r'[_.]\d{4}$')
+_UDIM_PERCENT_RE = re.compile(r'%\(UDIM\)d')
+_TEX_TYPES_RE = re.compile("|".join(re.escape(t) for t in _TEX_TYPE_LOWER.values()))
+
+_dir_cache = {}
+_isdir_cache = {}
+_type_bucket_cache = {}
+
+def _scan_dir(path):
+    mtime = os.stat(path).st_mtime_ns
+    cached = _dir_cache.get(path)
+    if cached and cached[0] == mtime: return cached[1]
+    with os.scandir(path) as entries: file_names = [(e.name, e.name.lower()) for e in entries if e.is_file()]
+    _dir_cache[path] = (mtime, file_names)
+    return file_names
+
+def _scan_type_buckets(path):
+    file_names = _scan_dir(path)
+    cached = _type_bucket_cache.get(path)
+    if cached and cached[0] is file_names: return cached[1]
+    buckets = {t: [] for t in _TEX_TYPE_LOWER.values()}
+    for entry in file_names:
+        if not _TEX_TYPES_RE.search(entry[1]): continue
+        for type_lower, bucket in buckets.items():
+            if type_lower in entry[1]: bucket.append(entry)
+    _type_bucket_cache[path] = (file_names, buckets)
+    return buckets
+
+def _isdir(path):
+    if path in _dir_cache: return True
+    is_dir = _isdir_cache.get(path)
+    if is_dir is None: is_dir = _isdir_cache[path] = os.path.isdir(path)
+    return is_dir
+
+def _invalidate_dir_cache(path=None):
+    if path is None: _dir_cache.clear(); _isdir_cache.clear(); _type_bucket_cache.clear()
+    else: _dir_cache.pop(path, None); _isdir_cache.pop(path, None); _type_bucket_cache.pop(path, None)
+
+def _file_mtime(path):
+    try: return os.stat(path).st_mtime_ns
+    except OSError: return None
+
+def _mtlx_image_children(subnet_node):
+    return tuple(child for child in subnet_node.children() if child.type() == _MTLX_IMAGE_TYPE)
+
+@contextlib.contextmanager
+def _manual_update_mode():
+    previous_mode = hou.updateModeSetting()
+    hou.setUpdateMode(hou.updateMode.Manual)
+    try: yield
+    finally: hou.setUpdateMode(previous_mode)
 
 class MaterialBuilderWindow(QtWidgets.QWidget):
     def __init__(self, parent=None):
@@ -18,6 +83,9 @@ class MaterialBuilderWindow(QtWidgets.QWidget):
         self.setGeometry(100, 100, 500, 550)
         self.setWindowFlags(QtCore.Qt.Window | QtCore.Qt.WindowStaysOnTopHint | QtCore.Qt.Tool)
         self.udim_state = {}
+        self._image_row_widgets = {}
+        self._texture_mtimes = {}
+        self._pending_list_refresh = False
         self.setup_ui()
         self.populate_material_list()
 
@@ -55,7 +123,7 @@ class MaterialBuilderWindow(QtWidgets.QWidget):
         self.material_selector_combo.setMinimumWidth(200)
         self.material_selector_combo.currentIndexChanged.connect(self.update_image_node_list)
         self.refresh_material_list_button = QtWidgets.QPushButton("リスト更新")
-        self.refresh_material_list_button.clicked.connect(self.populate_material_list)
+        self.refresh_material_list_button.clicked.connect(self.refresh_material_list)
         selection_layout.addWidget(selection_label)
         selection_layout.addWidget(self.material_selector_combo)
         selection_layout.addWidget(self.refresh_material_list_button)
@@ -80,38 +148,56 @@ class MaterialBuilderWindow(QtWidgets.QWidget):
         main_layout.addWidget(self.status_label)
         self.setLayout(main_layout)
 
-    def create_material_network(self, mat_lib_node, material_name):
-        mat_subnet_node = voptoolutils._setupMtlXBuilderSubnet(subnet_node=None, destination_node=mat_lib_node, name=material_name, mask=voptoolutils.MTLX_TAB_MASK, folder_label='USD Material Builder', render_context="kma")
+    def _resolve_texture_paths(self, material_name, material_texture_dir=None):
+        if material_texture_dir is None: material_texture_dir = self._get_texture_directory(material_name)
+        return {img_name: self.find_texture_file(material_texture_dir, img_name) for img_name in _TEXTURE_SIGNATURES}
+
+    def create_material_network(self, mat_lib_node, material_name, template_node=None, texture_paths=None):
+        if texture_paths is None: texture_paths = self._resolve_texture_paths(material_name)
+        if template_node:
+            mat_subnet_node = hou.copyNodesTo((template_node,), mat_lib_node)[0]
+            try: mat_subnet_node.setName(material_name)
+            except hou.OperationFailed: mat_subnet_node.destroy(); raise
+            mat_subnet_node.moveToGoodPosition()
+            for img_name in _TEXTURE_SIGNATURES:
+                image_node = mat_subnet_node.node(img_name)
+                if not image_node: continue
+                texture_path = texture_paths.get(img_name); file_parm = image_node.parm("file")
+                if texture_path: file_parm.set(texture_path)
+                else: file_parm.revertToDefaults()
+            return mat_subnet_node
+
+        mat_subnet_node = voptoolutils._setupMtlXBuilderSubnet(subnet_node=None, destination_node=mat_lib_node, name=material_name, mask=_MTLX_TAB_MASK, folder_label='USD Material Builder', render_context="kma")
         if not mat_subnet_node: return None
 
         surface = mat_subnet_node.node('mtlxstandard_surface')
+        input_idx = {name: surface.inputIndex(name) for name in _SURFACE_INPUT_NAMES}
         image_nodes = {}
-        texture_info = {"base_color": "color3", "specular_roughness": "float", "metalness": "float", "normal": "vector3", "transmission": "float", "opacity": "float", "displacement": "float"}
-        material_texture_dir = self._get_texture_directory(material_name)
 
-        for img_name, signature in texture_info.items():
+        for img_name, signature in _TEXTURE_SIGNATURES.items():
             new_node = mat_subnet_node.createNode("mtlximage", img_name)
             image_nodes[img_name] = new_node
             new_node.parm("signature").set(signature)
-            texture_path = self.find_texture_file(material_texture_dir, img_name)
+            texture_path = texture_paths.get(img_name)
             if texture_path: new_node.parm("file").set(texture_path)
 
         if "normal" in image_nodes:
             normalmap_node = mat_subnet_node.node('normalmap')
             if not normalmap_node: normalmap_node = mat_subnet_node.createNode('mtlxnormalmap', 'normalmap')
             normalmap_node.setInput(0, image_nodes["normal"])
-            surface.setInput(surface.inputIndex('normal'), normalmap_node)
+            surface.setInput(input_idx['normal'], normalmap_node)
 
         if "displacement" in image_nodes:
             displacement_node = mat_subnet_node.node('mtlxdisplacement')
             if not displacement_node: displacement_node = mat_subnet_node.createNode('mtlxdisplacement', 'mtlxdisplacement')
             displacement_node.setInput(0, image_nodes["displacement"])
-            if surface.inputIndex('displacementshader') != -1:
-                surface.setInput(surface.inputIndex('displacementshader'), displacement_node)
+            if input_idx['displacementshader'] != -1:
+                surface.setInput(input_idx['displacementshader'], displacement_node)
 
-        for img_name, node in image_nodes.items()
-            if img_name not in ["normal", "displacement", "opacity"] and surface.inputIndex(img_name) != -1:
-                surface.setInput(surface.inputIndex(img_name), node)
+        for img_name in _SECONDARY_INPUTS:
+            node = image_nodes.get(img_name)
+            if node and input_idx[img_name] != -1:
+                surface.setInput(input_idx[img_name], node)
 
         mat_subnet_node.layoutChildren()
         return mat_subnet_node
@@ -124,35 +210,38 @@ class MaterialBuilderWindow(QtWidgets.QWidget):
         except Exception as e: self.handle_error(e)
     def _get_texture_directory(self, material_name):
         specific_texture_dir = os.path.join(TEX_ROOT_DIR, material_name)
-        if os.path.isdir(specific_texture_dir):
+        if _isdir(specific_texture_dir):
             print(f"情報: 具体的なテクスチャフォルダ '{specific_texture_dir}' を使用します。"); return specific_texture_dir
-        base_name = re.sub(r'(\d+)$', '', material_name)
+        base_name = _TRAILING_DIGITS_RE.sub('', material_name)
         base_texture_dir = os.path.join(TEX_ROOT_DIR, base_name)
         if base_name != material_name: print(f"情報: '{specific_texture_dir}' が見つからないため、基本フォルダ '{base_texture_dir}' を検索します。")
         return base_texture_dir
     def find_texture_file(self, texture_dir, texture_type):
-        if not os.path.isdir(texture_dir): return None
-        udim_pattern = re.compile(r'(.+?)[._](\d{4})\.(.+)$', re.IGNORECASE)
-        udim_sets = {}
-        for filename in os.listdir(texture_dir):
-            if os.path.isfile(os.path.join(texture_dir, filename)) and texture_type.lower() in filename.lower():
-                match = udim_pattern.match(filename)
-                if match:
-                    base_name = match.group(1)
-                    if base_name not in udim_sets: udim_sets[base_name] = []
-                    udim_sets[base_name].append(match.group(2))
+        if not _isdir(texture_dir): return None
+        texture_type_lower = _TEX_TYPE_LOWER.get(texture_type) or texture_type.lower()
+        try:
+            file_names = _scan_type_buckets(texture_dir).get(texture_type_lower)
+            if file_names is None: file_names = [e for e in _scan_dir(texture_dir) if texture_type_lower in e[1]]
+        except OSError: return None
+        prefixes = (texture_type_lower + '_', texture_type_lower + '.')
+        texture_dir_posix = texture_dir.replace("\\", "/").rstrip("/")
+        udim_sets = defaultdict(list); best_base_name = best_original = None; exact_match = prefix_match = shortest_match = None
+        for filename, filename_lower in file_names:
+            match = _UDIM_RE.match(filename)
+            if match:
+                base_name, tile = match.group(1), match.group(2)
+                if best_base_name is None or (tile == '1001' and '1001' not in udim_sets[best_base_name]): best_base_name, best_original = base_name, filename
+                udim_sets[base_name].append(tile)
+            elif not udim_sets:
+                if exact_match is None and (filename_lower.rpartition('.')[0] or filename_lower) == texture_type_lower: exact_match = filename
+                if prefix_match is None and filename_lower.startswith(prefixes): prefix_match = filename
+                if shortest_match is None or len(filename) < len(shortest_match): shortest_match = filename
         if udim_sets:
-            best_base_name = next((b for b, t in udim_sets.items() if '1001' in t), list(udim_sets.keys())[0])
-            original_filename = next((f for f in os.listdir(texture_dir) if f.startswith(best_base_name)), f"{best_base_name}.{udim_sets[best_base_name][0]}.png")
-            _, ext = os.path.splitext(original_filename)
-            return os.path.join(texture_dir, f"{best_base_name}_<UDIM>{ext}").replace("\\", "/")
-        single_files = [f for f in os.listdir(texture_dir) if os.path.isfile(os.path.join(texture_dir, f)) and texture_type.lower() in f.lower() and not udim_pattern.search(f)]
-        if not single_files: return None
-        exact_match = next((f for f in single_files if os.path.splitext(f)[0].lower() == texture_type.lower()), None)
-        if exact_match: return os.path.join(texture_dir, exact_match).replace("\\", "/")
-        prefix_match = next((f for f in single_files if f.lower().startswith(texture_type.lower() + '_') or f.lower().startswith(texture_type.lower() + '.')), None)
-        if prefix_match: return os.path.join(texture_dir, prefix_match).replace("\\", "/")
-        return os.path.join(texture_dir, min(single_files, key=len)).replace("\\", "/")
+            _, dot, tail = best_original.rpartition('.'); ext = dot + tail if dot else ''
+            return f"{texture_dir_posix}/{best_base_name}_<UDIM>{ext}"
+        single_match = exact_match or prefix_match or shortest_match
+        if single_match: return f"{texture_dir_posix}/{single_match}"
+        return None
     def _get_or_create_base_nodes(self, selected_nodes=None):
         stage = hou.node('/stage');
         if not stage: self.status_label.setText("<font color='red'>エラー: /stage ノードが見つかりません。</font>"); return None, None
@@ -164,14 +253,17 @@ class MaterialBuilderWindow(QtWidgets.QWidget):
         assign_node = stage.node("assignmaterial")
         if not assign_node: assign_node = stage.createNode('assignmaterial', 'assignmaterial'); assign_node.setInput(0, mat_lib_node); assign_node.moveToGoodPosition()
         return mat_lib_node, assign_node
-    def _update_assign_node(self, mat_lib_node, assign_node):
-        all_materials_in_lib = self._get_material_nodes()
-        assign_node.parm('nummaterials').set(len(all_materials_in_lib))
-        for i, material_node in enumerate(all_materials_in_lib):
-            parm_index = i + 1; prim_path = "/" + material_node.name()
-            mat_usd_path = mat_lib_node.parm("matpathprefix").eval() + material_node.name()
-            prim_pattern_parm = assign_node.parm(f'primpattern{parm_index}'); mat_path_parm = assign_node.parm(f'matspecpath{parm_index}')
-            if prim_pattern_parm and mat_path_parm: prim_pattern_parm.set(prim_path); mat_path_parm.set(mat_usd_path)
+    def _update_assign_node(self, mat_lib_node, assign_node, material_nodes=None):
+        all_materials_in_lib = material_nodes if material_nodes is not None else self._get_material_nodes(mat_lib_node)
+        mat_path_prefix = mat_lib_node.parm("matpathprefix").eval(); parm_values = {}
+        with hou.undos.group("Assign Materials"):
+            assign_node.parm('nummaterials').set(len(all_materials_in_lib))
+            for i, material_node in enumerate(all_materials_in_lib):
+                parm_index = i + 1; material_name = material_node.name()
+                prim_pattern_name = f'primpattern{parm_index}'; mat_path_name = f'matspecpath{parm_index}'
+                if not (assign_node.parm(prim_pattern_name) and assign_node.parm(mat_path_name)): continue
+                parm_values[prim_pattern_name] = "/" + material_name; parm_values[mat_path_name] = mat_path_prefix + material_name
+            if parm_values: assign_node.setParms(parm_values)
     def create_materials_from_selection(self):
         self.create_button.setEnabled(False); self.status_label.setText("一括作成を開始します..."); QtWidgets.QApplication.processEvents()
         try:
@@ -179,15 +271,27 @@ class MaterialBuilderWindow(QtWidgets.QWidget):
             if not selected_nodes or not all(isinstance(n, hou.LopNode) for n in selected_nodes): self.status_label.setText("<font color='red'>エラー: LOPネットワーク内のソースノードを1つ以上選択してください。</font>"); self.create_button.setEnabled(True); return
             mat_lib_node, assign_node = self._get_or_create_base_nodes(selected_nodes)
             if not mat_lib_node or not assign_node: self.create_button.setEnabled(True); return
-            existing_names = [child.name() for child in self._get_material_nodes()]
+            material_nodes = self._get_material_nodes(mat_lib_node); existing_names = {child.name() for child in mat_lib_node.children()}
+            unique_material_names = []
             for source_node in selected_nodes:
                 base_material_name = source_node.name(); unique_material_name = base_material_name; suffix = 1
                 while unique_material_name in existing_names: unique_material_name = f"{base_material_name}{suffix}"; suffix += 1
-                existing_names.append(unique_material_name)
-                self.create_material_network(mat_lib_node, unique_material_name)
-            self._update_assign_node(mat_lib_node, assign_node)
+                existing_names.add(unique_material_name); unique_material_names.append(unique_material_name)
+            texture_dirs = [self._get_texture_directory(name) for name in unique_material_names]
+            if len(unique_material_names) == 1: texture_path_maps = [self._resolve_texture_paths(unique_material_names[0], texture_dirs[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=min(8, len(unique_material_names))) as executor:
+                    texture_path_maps = list(executor.map(self._resolve_texture_paths, unique_material_names, texture_dirs))
+            with _manual_update_mode():
+                template_node = None
+                for unique_material_name, texture_paths in zip(unique_material_names, texture_path_maps):
+                    mat_subnet_node = self.create_material_network(mat_lib_node, unique_material_name, template_node, texture_paths)
+                    if not mat_subnet_node: continue
+                    material_nodes.append(mat_subnet_node)
+                    if not template_node: template_node = mat_subnet_node
+                self._update_assign_node(mat_lib_node, assign_node, material_nodes)
             self.status_label.setText(f"<font color='green'>成功: {len(selected_nodes)}個のマテリアルを作成・更新しました。</font>")
-            self.populate_material_list()
+            self._schedule_material_list_refresh()
         except Exception as e: self.handle_error(e)
         finally: self.create_button.setEnabled(True)
     def add_single_material(self):
@@ -197,13 +301,15 @@ class MaterialBuilderWindow(QtWidgets.QWidget):
             if not base_material_name: self.status_label.setText("<font color='red'>エラー: マテリアル名を入力してください。</font>"); self.add_single_button.setEnabled(True); return
             mat_lib_node, assign_node = self._get_or_create_base_nodes()
             if not mat_lib_node or not assign_node: self.add_single_button.setEnabled(True); return
-            existing_names = [child.name() for child in self._get_material_nodes()]
+            existing_names = {child.name() for child in mat_lib_node.children()}
             unique_material_name = base_material_name; suffix = 1
             while unique_material_name in existing_names: unique_material_name = f"{base_material_name}{suffix}"; suffix += 1
-            if self.create_material_network(mat_lib_node, unique_material_name):
-                self._update_assign_node(mat_lib_node, assign_node)
+            with _manual_update_mode():
+                mat_subnet_node = self.create_material_network(mat_lib_node, unique_material_name)
+                if mat_subnet_node: self._update_assign_node(mat_lib_node, assign_node)
+            if mat_subnet_node:
                 self.status_label.setText(f"<font color='green'>成功: マテリアル '{unique_material_name}' を追加しました。</font>")
-                self.populate_material_list()
+                self._schedule_material_list_refresh()
         except Exception as e: self.handle_error(e)
         finally: self.add_single_button.setEnabled(True)
     def reload_textures_for_selected_material(self):
@@ -212,20 +318,25 @@ class MaterialBuilderWindow(QtWidgets.QWidget):
         mat_subnet_node = hou.node(selected_mat_path)
         if not mat_subnet_node: return
         self.status_label.setText(f"'{mat_subnet_node.name()}'のテクスチャを検索・再読込中..."); QtWidgets.QApplication.processEvents()
-        material_texture_dir = self._get_texture_directory(mat_subnet_node.name())
-        updated_count = 0; image_node_count = 0
-        for child in mat_subnet_node.children():
-            if child.type().name() == "mtlximage":
+        mat_name = mat_subnet_node.name()
+        _invalidate_dir_cache(os.path.join(TEX_ROOT_DIR, mat_name)); _invalidate_dir_cache(os.path.join(TEX_ROOT_DIR, _TRAILING_DIGITS_RE.sub('', mat_name)))
+        material_texture_dir = self._get_texture_directory(mat_name)
+        updated_count = 0; unchanged_count = 0; image_node_count = 0
+        with _manual_update_mode():
+            for child in _mtlx_image_children(mat_subnet_node):
                 image_node_count += 1; texture_type = child.name()
                 texture_path = self.find_texture_file(material_texture_dir, texture_type)
                 file_parm = child.parm("file")
-                if file_parm:
-                    current_path = file_parm.eval()
-                    if texture_path and texture_path != current_path:
+                if file_parm and texture_path:
+                    current_path = file_parm.eval(); texture_mtime = _file_mtime(texture_path)
+                    if texture_path != current_path:
                         file_parm.set(texture_path); print(f"情報: '{child.name()}' にパス '{texture_path}' を設定しました。"); updated_count += 1
-                    elif texture_path and texture_path == current_path:
+                    elif texture_mtime is None or texture_mtime != self._texture_mtimes.get(texture_path):
                         file_parm.set(texture_path); print(f"情報: '{child.name()}' のパス '{texture_path}' を再読み込みしました。"); updated_count += 1
+                    else: unchanged_count += 1
+                    self._texture_mtimes[texture_path] = texture_mtime
         if updated_count > 0: self.status_label.setText(f"<font color='green'>成功: {updated_count}個のテクスチャパスを更新しました。</font>")
+        elif unchanged_count > 0: self.status_label.setText(f"<font color='blue'>{unchanged_count}個のテクスチャは変更がないため再読込をスキップしました。</font>")
         elif image_node_count > 0: self.status_label.setText(f"<font color='orange'>警告: '{os.path.basename(material_texture_dir)}'のフォルダに更新可能なテクスチャは見つかりませんでした。</font>")
         else: self.status_label.setText(f"<font color='orange'>警告: マテリアル内にmtlximageノードがありません。</font>")
         hou.ui.triggerUpdate()
@@ -235,42 +346,60 @@ class MaterialBuilderWindow(QtWidgets.QWidget):
     def create_separator(self):
         line = QtWidgets.QFrame(); line.setFrameShape(QtWidgets.QFrame.HLine); line.setFrameShadow(QtWidgets.QFrame.Sunken); return line
     def closeEvent(self, event):
-        global _material_builder_window_instance;
-        if _material_builder_window_instance == self: _material_builder_window_instance = None
+        _invalidate_dir_cache()
         super(MaterialBuilderWindow, self).closeEvent(event)
-    def _get_material_nodes(self):
-        stage = hou.node('/stage');
-        if not stage: return []
-        mat_lib_node = stage.node('materiallibrary');
-        if not mat_lib_node: return []
+    def _get_material_nodes(self, mat_lib_node=None):
+        if not mat_lib_node:
+            stage = hou.node('/stage');
+            if not stage: return []
+            mat_lib_node = stage.node('materiallibrary');
+            if not mat_lib_node: return []
         return [child for child in mat_lib_node.children() if child.isSubNetwork()]
+    def _schedule_material_list_refresh(self):
+        if self._pending_list_refresh: return
+        self._pending_list_refresh = True; QtCore.QTimer.singleShot(0, self._do_refresh_list)
+    def _do_refresh_list(self):
+        self._pending_list_refresh = False; self.populate_material_list()
+    def refresh_material_list(self):
+        _invalidate_dir_cache(); self.populate_material_list()
     def populate_material_list(self):
         current_selection = self.material_selector_combo.currentData()
         self.material_selector_combo.clear(); material_builders = self._get_material_nodes()
         if not material_builders:
             self.material_selector_combo.addItem("--- No Materials Found ---"); self.udim_toggle_button.setEnabled(False); self.reload_textures_button.setEnabled(False); self.layout_stage_button.setEnabled(False)
         else:
-            for node in sorted(material_builders, key=lambda n: n.name()): self.material_selector_combo.addItem(node.name(), node.path())
+            named_builders = [(node.name(), node) for node in material_builders]; named_builders.sort(key=lambda p: p[0])
+            for name, node in named_builders: self.material_selector_combo.addItem(name, node.path())
             self.udim_toggle_button.setEnabled(True); self.reload_textures_button.setEnabled(True); self.layout_stage_button.setEnabled(True)
             index = self.material_selector_combo.findData(current_selection)
             if index != -1: self.material_selector_combo.setCurrentIndex(index)
         self.update_image_node_list()
     def update_image_node_list(self):
-        while self.image_nodes_layout.count():
-            child = self.image_nodes_layout.takeAt(0)
-            if child.widget(): child.widget().deleteLater()
-        selected_mat_path = self.material_selector_combo.currentData()
-        if not selected_mat_path: self.reload_textures_button.setEnabled(False); self.layout_stage_button.setEnabled(False); return
-        mat_subnet_node = hou.node(selected_mat_path)
-        if not mat_subnet_node or not mat_subnet_node.isSubNetwork(): self.reload_textures_button.setEnabled(False); self.layout_stage_button.setEnabled(False); return
-        self.reload_textures_button.setEnabled(True); self.layout_stage_button.setEnabled(True)
-        image_nodes = [child for child in mat_subnet_node.children() if child.type().name() == "mtlximage"]
-        for child in sorted(image_nodes, key=lambda n: n.name()):
-            h_layout = QtWidgets.QHBoxLayout(); label = QtWidgets.QLabel(f"{child.name()}:"); label.setFixedWidth(120); h_layout.addWidget(label)
-            toggle_button = QtWidgets.QPushButton(); toggle_button.setFixedWidth(80); toggle_button.setProperty("node_path", child.path())
-            is_connected = self.is_image_node_connected(child)
-            toggle_button.setText("無効化" if is_connected else "有効化"); toggle_button.setStyleSheet("background-color: #4ADE80;" if is_connected else "background-color: #F87171;"); toggle_button.clicked.connect(self.toggle_image_node_connection)
-            h_layout.addWidget(toggle_button); h_layout.addStretch(1); self.image_nodes_layout.addLayout(h_layout)
+        self.image_nodes_group.setUpdatesEnabled(False)
+        try: self._rebuild_image_node_list()
+        finally: self.image_nodes_group.setUpdatesEnabled(True)
+    def _rebuild_image_node_list(self):
+        while self.image_nodes_layout.count(): self.image_nodes_layout.takeAt(0)
+        image_nodes = []; selected_mat_path = self.material_selector_combo.currentData()
+        mat_subnet_node = hou.node(selected_mat_path) if selected_mat_path else None
+        if mat_subnet_node and mat_subnet_node.isSubNetwork():
+            self.reload_textures_button.setEnabled(True); self.layout_stage_button.setEnabled(True)
+            image_nodes = _mtlx_image_children(mat_subnet_node)
+        else: self.reload_textures_button.setEnabled(False); self.layout_stage_button.setEnabled(False)
+        named_image_nodes = [(child.name(), child) for child in image_nodes]; named_image_nodes.sort(key=lambda p: p[0])
+        image_node_names = {name for name, _ in named_image_nodes}
+        for name in [n for n in self._image_row_widgets if n not in image_node_names]: self._image_row_widgets.pop(name)[0].deleteLater()
+        for name, child in named_image_nodes:
+            row = self._image_row_widgets.get(name)
+            if not row:
+                row_widget = QtWidgets.QWidget(); h_layout = QtWidgets.QHBoxLayout(row_widget); h_layout.setContentsMargins(0, 0, 0, 0)
+                label = QtWidgets.QLabel(f"{name}:"); label.setFixedWidth(120); h_layout.addWidget(label)
+                toggle_button = QtWidgets.QPushButton(); toggle_button.setFixedWidth(80); toggle_button.clicked.connect(self.toggle_image_node_connection)
+                h_layout.addWidget(toggle_button); h_layout.addStretch(1); row = self._image_row_widgets[name] = (row_widget, label, toggle_button)
+            row_widget, _, toggle_button = row
+            is_connected = self.is_image_node_connected(child); toggle_button.setProperty("node_path", child.path())
+            toggle_button.setText("無効化" if is_connected else "有効化"); toggle_button.setStyleSheet("background-color: #4ADE80;" if is_connected else "background-color: #F87171;")
+            self.image_nodes_layout.addWidget(row_widget)
     def is_image_node_connected(self, image_node):
         mat_subnet_node = image_node.parent(); surface_node = mat_subnet_node.node('mtlxstandard_surface')
         if not surface_node: return False
@@ -303,34 +432,36 @@ class MaterialBuilderWindow(QtWidgets.QWidget):
         mat_subnet_node = hou.node(selected_mat_path)
         if not mat_subnet_node: return
         mat_path = mat_subnet_node.path(); is_udim = self.udim_state.get(mat_path, False)
-        for child in mat_subnet_node.children():
-            if child.type().name() == "mtlximage":
-                file_parm = child.parm("file");
-                if not file_parm: continue
-                current_path = file_parm.eval()
-                if not current_path:
-                    material_texture_dir = self._get_texture_directory(mat_subnet_node.name())
-                    found_path = self.find_texture_file(material_texture_dir, child.name())
-                    if found_path: file_parm.set(found_path); current_path = found_path
-                    else: continue
-                if is_udim:
-                    new_path = re.sub(r'[_.]<UDIM>', '', current_path)
-                    if new_path == current_path: new_path = re.sub(r'%\(UDIM\)d', '1001', new_path)
-                    file_parm.set(new_path)
-                else:
-                    dir_path, base_filename = os.path.split(current_path); name_without_ext, ext = os.path.splitext(base_filename)
-                    cleaned_name = re.sub(r'[_.]\d{4}$', '', name_without_ext)
-                    udim_filename = f"{cleaned_name}_<UDIM>{ext}"; new_path = os.path.join(dir_path, udim_filename).replace("\\", "/")
-                    file_parm.set(new_path)
+        material_texture_dir = None; parm_updates = []
+        for child in _mtlx_image_children(mat_subnet_node):
+            file_parm = child.parm("file");
+            if not file_parm: continue
+            current_path = file_parm.eval()
+            if not current_path:
+                if material_texture_dir is None: material_texture_dir = self._get_texture_directory(mat_subnet_node.name())
+                current_path = self.find_texture_file(material_texture_dir, child.name())
+                if not current_path: continue
+            if is_udim:
+                new_path = _UDIM_TAG_RE.sub('', current_path)
+                if new_path == current_path: new_path = _UDIM_PERCENT_RE.sub('1001', new_path)
+            else:
+                dir_path, base_filename = os.path.split(current_path); name_without_ext, ext = os.path.splitext(base_filename)
+                cleaned_name = _UDIM_4DIGIT_TAIL_RE.sub('', name_without_ext)
+                udim_filename = f"{cleaned_name}_<UDIM>{ext}"; new_path = os.path.join(dir_path, udim_filename).replace("\\", "/")
+            parm_updates.append((file_parm, new_path))
+        with hou.undos.group("Toggle UDIM Paths"), _manual_update_mode():
+            for file_parm, new_path in parm_updates: file_parm.set(new_path)
         self.udim_state[mat_path] = not is_udim
         new_state_str = "UDIM" if not is_udim else "Original"; self.status_label.setText(f"<font color='blue'>パスを {new_state_str} に切り替えました。</font>")
 
 _material_builder_window_instance = None
 def show_material_builder_creator_window():
     global _material_builder_window_instance
-    if _material_builder_window_instance is not None:
-        try: _material_builder_window_instance.close(); _material_builder_window_instance.deleteLater()
-        except Exception: pass
+    if _material_builder_window_instance is not None and shiboken2.isValid(_material_builder_window_instance):
+        if not _material_builder_window_instance.isVisible(): _material_builder_window_instance.refresh_material_list()
+        _material_builder_window_instance.show()
+        _material_builder_window_instance.raise_(); _material_builder_window_instance.activateWindow()
+        return
     app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
     houdini_main_window = hou.ui.mainQtWindow()
     _material_builder_window_instance = MaterialBuilderWindow(parent=houdini_main_window)
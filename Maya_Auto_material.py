@@ -2,12 +2,17 @@ import maya.cmds as mc
 import maya.mel as mel
 import os
 import re
+import bisect
+import string
+import contextlib
 from functools import partial
+from collections import OrderedDict
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
 
 from PySide6 import QtWidgets, QtCore, QtGui
 from maya.app.general.mayaMixin import MayaQWidgetBaseMixin
-from shiboken6 import wrapInstance
-from maya import OpenMayaUI as omui
+import maya.api.OpenMaya as om2
 
 
 ATTRIBUTE_MAP = {
@@ -19,29 +24,261 @@ ATTRIBUTE_MAP = {
     "opacity": "opacity"
 }
 
-LINEAR_WORKFLOW_TYPES = [
+LINEAR_WORKFLOW_TYPES = frozenset([
     "metalness", "specular", "specular_roughness", "transmission", "opacity", "normal", "displacement"
-]
+])
+
+ALL_TEX_TYPES = tuple(ATTRIBUTE_MAP) + ("normal", "displacement")
+
+ATTR_FOR_TYPE = MappingProxyType({**ATTRIBUTE_MAP, "normal": "normalCamera"})
+
+NAME_SAFE_CHARS = frozenset(string.ascii_letters + string.digits + '_')
+
+TEXTURE_EXTENSIONS = frozenset(['exr', 'tif', 'tiff', 'png', 'jpg', 'jpeg', 'tga', 'tx', 'tex', 'hdr', 'bmp', 'psd'])
+
+UDIM_FILE_PATTERN = re.compile(r'(.+?)[._](\d{4})\.(.+)$', re.IGNORECASE)
+
+CLEANUP_NODE_TYPES = frozenset(['file', 'place2dTexture', 'aiNormalMap', 'bump2d', 'displacementShader'])
+
+SHADING_ENGINE_WATCH_ATTRS = frozenset(['dagSetMembers', 'surfaceShader'])
+
+P2D_TO_FILE_ATTRS = (
+    ("coverage", "coverage"), ("translateFrame", "translateFrame"), ("rotateFrame", "rotateFrame"),
+    ("mirrorU", "mirrorU"), ("mirrorV", "mirrorV"), ("stagger", "stagger"), ("wrapU", "wrapU"), ("wrapV", "wrapV"),
+    ("repeatUV", "repeatUV"), ("offset", "offset"), ("rotateUV", "rotateUV"), ("noiseUV", "noiseUV"),
+    ("outUV", "uvCoord"), ("outUvFilterSize", "uvFilterSize")
+)
+
+CREATE_FILE_NODE_MEL_PROC = "MTM_createTextureFileNode"
+SET_PLUG_VALUES_MEL_PROC = "MTM_setPlugValues"
+
+SELECTION_SHADER_CACHE_SIZE = 16
+MATERIAL_LIST_DIFF_LIMIT = 32
+CONNECTION_STATE_LABELS = {"on": "ON", "off": "OFF", "none": "-"}
 
 OPTION_VAR_KEY = "MAYA_MATERIAL_ASSIGNER_SAVED_PATHS"
 
+SETTINGS_ORGANIZATION = "MaterialTextureManager"
+SETTINGS_APPLICATION = "paths"
+SETTINGS_HISTORY_KEY = "history"
+
+DEFAULT_SUBDIV_SETTINGS = (("aiSubdivType", 1), ("aiSubdivIterations", 2))
+
+
+def _get_depend_node(node_name):
+    selection_list = om2.MSelectionList()
+    selection_list.add(node_name)
+    return selection_list.getDependNode(0)
+
+def _get_mesh_shape_path(node_name):
+    selection_list = om2.MSelectionList()
+    try:
+        selection_list.add(node_name)
+        dag_path = selection_list.getDagPath(0)
+    except (RuntimeError, TypeError):
+        return None
+    for i in range(dag_path.numberOfShapesDirectlyBelow()):
+        shape_path = om2.MDagPath(dag_path).extendToShape(i)
+        if shape_path.hasFn(om2.MFn.kMesh):
+            return shape_path
+    return None
+
+def _get_shading_engine(fn_node):
+    for plug in fn_node.getConnections():
+        for dest_plug in plug.connectedTo(False, True):
+            if dest_plug.node().hasFn(om2.MFn.kShadingEngine):
+                return dest_plug.node()
+    return None
+
+def _get_plug_source_name(fn_node, attr):
+    try:
+        source = fn_node.findPlug(attr, False).source()
+    except RuntimeError:
+        return None
+    return None if source.isNull else om2.MFnDependencyNode(source.node()).name()
+
+def _iter_dependency_nodes(fn_type, type_name=None):
+    node_iter = om2.MItDependencyNodes(fn_type)
+    while not node_iter.isDone():
+        fn_node = om2.MFnDependencyNode(node_iter.thisNode())
+        if type_name is None or fn_node.typeName == type_name:
+            yield fn_node
+        node_iter.next()
+
+def _sanitize_name(name):
+    return ''.join(c if c in NAME_SAFE_CHARS else '_' for c in name)
+
+def _dir_key(path):
+    return os.path.normcase(os.path.normpath(path))
+
+def _scan_texture_dir(texture_dir):
+    try:
+        dir_mtime = os.stat(texture_dir).st_mtime_ns
+        with os.scandir(texture_dir) as it:
+            entries = [(entry.name, entry.name.lower()) for entry in it if entry.is_file()]
+    except OSError:
+        return None
+    return dir_mtime, entries
+
+def _fast_get(node, attr, default=None):
+    if not node:
+        return False, default
+    try:
+        return True, mc.getAttr(f"{node}.{attr}")
+    except (RuntimeError, ValueError):
+        return False, default
+
+def _mel_quote(value):
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+def _ensure_create_file_node_proc():
+    if mel.eval(f'exists "{CREATE_FILE_NODE_MEL_PROC}"'):
+        return
+    connects = "\n".join(
+        f'    connectAttr -f ($p2d + ".{src}") ($file + ".{dst}");' for src, dst in P2D_TO_FILE_ATTRS
+    )
+    mel.eval(f"""
+global proc string[] {CREATE_FILE_NODE_MEL_PROC}(string $fileName, string $p2dName, string $texturePath, string $colorSpace, int $alphaIsLuminance, int $udim)
+{{
+    string $file = `shadingNode -asTexture -isColorManaged -name $fileName file`;
+    string $p2d = `shadingNode -asUtility -name $p2dName place2dTexture`;
+{connects}
+    setAttr -type "string" ($file + ".fileTextureName") $texturePath;
+    if ($udim) setAttr ($file + ".uvTilingMode") 3;
+    if (`getAttr ($file + ".colorSpace")` != $colorSpace) setAttr -type "string" ($file + ".colorSpace") $colorSpace;
+    if (`getAttr ($file + ".alphaIsLuminance")` != $alphaIsLuminance) setAttr ($file + ".alphaIsLuminance") $alphaIsLuminance;
+    return {{$file, $p2d}};
+}}
+""")
+
+def _ensure_set_plug_values_proc():
+    if mel.eval(f'exists "{SET_PLUG_VALUES_MEL_PROC}"'):
+        return
+    mel.eval(f"""
+global proc int[] {SET_PLUG_VALUES_MEL_PROC}(string $plugs[], string $values[], int $isString[])
+{{
+    int $failed[];
+    for ($i = 0; $i < size($plugs); $i++) {{
+        if ($isString[$i]) {{
+            if (catch(`setAttr -type "string" $plugs[$i] $values[$i]`)) $failed[size($failed)] = $i;
+        }} else if (catch(`setAttr $plugs[$i] ((int)$values[$i])`)) {{
+            $failed[size($failed)] = $i;
+        }}
+    }}
+    return $failed;
+}}
+""")
+
+def _batched_set_attrs(writes):
+    if not writes:
+        return set()
+    _ensure_set_plug_values_proc()
+    plugs = ", ".join(_mel_quote(plug) for plug, _, _ in writes)
+    values = ", ".join(_mel_quote(value if kind == 'string' else str(int(value))) for _, value, kind in writes)
+    is_string = ", ".join('1' if kind == 'string' else '0' for _, _, kind in writes)
+    return set(mel.eval(f"{SET_PLUG_VALUES_MEL_PROC}({{{plugs}}}, {{{values}}}, {{{is_string}}})") or [])
 
 def get_maya_main_window():
+    from shiboken6 import wrapInstance
+    from maya import OpenMayaUI as omui
     main_window_ptr = omui.MQtUtil.mainWindow()
     if main_window_ptr is None:
         raise RuntimeError("Mayaのメインウィンドウが見つかりません。")
     return wrapInstance(int(main_window_ptr), QtWidgets.QWidget)
 
+@contextlib.contextmanager
+def _signals_blocked(*widgets):
+    blockers = [QtCore.QSignalBlocker(widget) for widget in widgets]
+    try:
+        yield
+    finally:
+        for blocker in blockers:
+            blocker.unblock()
+
+def _texture_file_mtime(path):
+    try:
+        if '<' in path:
+            return -1 if os.path.isdir(os.path.dirname(path)) else None
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+class TextureCheckSignals(QtCore.QObject):
+    finished = QtCore.Signal(object)
+
+class TextureExistenceCheck(QtCore.QRunnable):
+    def __init__(self, node_paths):
+        super(TextureExistenceCheck, self).__init__()
+        self.node_paths = node_paths
+        self.signals = TextureCheckSignals()
+
+    def run(self):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            mtimes = list(executor.map(_texture_file_mtime, [path for _, path in self.node_paths]))
+        self.signals.finished.emit([(node, path, mtime) for (node, path), mtime in zip(self.node_paths, mtimes)])
+
+class LazyComboBox(QtWidgets.QComboBox):
+    aboutToShowPopup = QtCore.Signal()
+
+    def showPopup(self):
+        self.aboutToShowPopup.emit()
+        super(LazyComboBox, self).showPopup()
+
 class MaterialTextureManagerWindow(MayaQWidgetBaseMixin, QtWidgets.QWidget):
     def __init__(self, parent=None):
         super(MaterialTextureManagerWindow, self).__init__(parent)
         self.setWindowTitle("Material & Texture Manager")
         self.resize(450, 400)
         self.setWindowFlags(QtCore.Qt.Window)
+        self.setAttribute(QtCore.Qt.WA_DeleteOnClose, False)
         
         self.selection_script_job = None
+        self.workspace_script_job = None
+        self._workspace_root_cache = None
+        self._texture_root_cache = (None, None)
+        self._path_history = []
+        self._path_history_dirty = False
+        self._path_history_modified = False
+        self._path_index = {}
         self.connection_buttons = {} 
         self._is_updating_ui = False 
+        self._callback_ids = []
+        self._node_callback_ids = []
+        self._shader_cache_sorted = None
+        self._material_list_dirty = False
+        self._material_row_lookup = {}
+        self._texture_check_signals = None
+        self._texture_mtimes = {}
+        self._shader_members_cache = {}
+        self._texture_index_cache = {}
+        self._texture_match_cache = {}
+        self._pending_dir_scans = {}
+        self._prefetch_executor = None
+        self._selection_shader_cache = OrderedDict()
+        self._scene_caches_dirty = False
+        self._pending_panel_refresh = None
+        self._delete_unused_running = False
+        self._last_connection_status = None
+        self._arnold_attr_cache = {}
+
+        self._update_timer = QtCore.QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.timeout.connect(self.update_selection_info)
+
+        self._subdiv_text_timer = QtCore.QTimer(self)
+        self._subdiv_text_timer.setSingleShot(True)
+        self._subdiv_text_timer.setInterval(16)
+        self._subdiv_text_timer.timeout.connect(self._flush_subdiv_text)
+
+        self._height_text_timer = QtCore.QTimer(self)
+        self._height_text_timer.setSingleShot(True)
+        self._height_text_timer.setInterval(16)
+        self._height_text_timer.timeout.connect(self._flush_height_text)
+
+        self._path_display_timer = QtCore.QTimer(self)
+        self._path_display_timer.setSingleShot(True)
+        self._path_display_timer.setInterval(150)
+        self._path_display_timer.timeout.connect(self.update_active_path_display)
 
         self.setup_ui()
         
@@ -50,9 +287,14 @@ class MaterialTextureManagerWindow(MayaQWidgetBaseMixin, QtWidgets.QWidget):
             self.assign_button.setEnabled(False)
             self.status_label.setText("<font color='red'>Arnold (mtoa) is not loaded.</font>")
         
-        self.load_saved_paths()
+        self._path_history = self._read_path_history()
+        self._path_history_dirty = True
+        self._path_model.setStringList(["[Default] Project's sourceimages"])
+        self.update_active_path_display()
+        self.register_scene_callbacks()
         self.populate_material_list()
         self.start_selection_monitor()
+        self.workspace_script_job = mc.scriptJob(event=["workspaceChanged", self._on_workspace_changed], protected=True)
         self.update_selection_info() 
 
     def setup_ui(self):
@@ -75,7 +317,9 @@ class MaterialTextureManagerWindow(MayaQWidgetBaseMixin, QtWidgets.QWidget):
         
         material_selector_layout = QtWidgets.QHBoxLayout()
         material_selector_label = QtWidgets.QLabel("シーンのマテリアル:")
-        self.material_selector_combo = QtWidgets.QComboBox()
+        self.material_selector_combo = LazyComboBox()
+        self._material_model = QtCore.QStringListModel(self)
+        self.material_selector_combo.setModel(self._material_model)
         self.refresh_materials_button = QtWidgets.QPushButton("リスト更新")
         self.refresh_materials_button.setToolTip("シーン内のaiStandardSurfaceマテリアルリストを更新します。")
         material_selector_layout.addWidget(material_selector_label)
@@ -107,8 +351,10 @@ class MaterialTextureManagerWindow(MayaQWidgetBaseMixin, QtWidgets.QWidget):
         path_layout = QtWidgets.QVBoxLayout()
 
         path_input_layout = QtWidgets.QHBoxLayout()
-        self.custom_path_combo = QtWidgets.QComboBox()
+        self.custom_path_combo = LazyComboBox()
         self.custom_path_combo.setEditable(True)
+        self._path_model = QtCore.QStringListModel(self)
+        self.custom_path_combo.setModel(self._path_model)
         self.custom_path_combo.setToolTip("テクスチャを検索するルートフォルダを指定します。\n入力完了後、自動で履歴に保存されます。")
         self.browse_button = QtWidgets.QPushButton("参照...")
         
@@ -129,19 +375,22 @@ class MaterialTextureManagerWindow(MayaQWidgetBaseMixin, QtWidgets.QWidget):
         path_group.setLayout(path_layout)
         
         connection_group = QtWidgets.QGroupBox("テクスチャ接続の管理")
+        connection_group.setStyleSheet(
+            'QPushButton[state="on"] { background-color: #02B918; color: white; }'
+            'QPushButton[state="off"] { background-color: #6B7280; color: white; }'
+        )
         connection_layout = QtWidgets.QGridLayout()
         
-        all_texture_types = list(ATTRIBUTE_MAP.keys()) + ["normal", "displacement"]
-        row, col = 0, 0
-        for tex_type in all_texture_types:
-            button = QtWidgets.QPushButton(f"{tex_type}: -")
+        self._connection_button_texts = {
+            tex_type: {state: f"{tex_type}: {label}" for state, label in CONNECTION_STATE_LABELS.items()}
+            for tex_type in ALL_TEX_TYPES
+        }
+        self.connection_buttons = {tex_type: QtWidgets.QPushButton(self._connection_button_texts[tex_type]["none"]) for tex_type in ALL_TEX_TYPES}
+        for i, (tex_type, button) in enumerate(self.connection_buttons.items()):
+            button.setProperty("state", "none")
             button.setToolTip(f"{tex_type} テクスチャの接続をトグルします。")
             button.clicked.connect(partial(self.toggle_texture_connection_by_type, tex_type))
-            connection_layout.addWidget(button, row, col)
-            self.connection_buttons[tex_type] = button
-            col += 1
-            if col > 1:
-                col, row = 0, row + 1
+            connection_layout.addWidget(button, *divmod(i, 2))
         connection_group.setLayout(connection_layout)
 
         arnold_group = QtWidgets.QGroupBox("Arnold アトリビュート")
@@ -206,12 +455,15 @@ class MaterialTextureManagerWindow(MayaQWidgetBaseMixin, QtWidgets.QWidget):
         top_layout.addWidget(self.status_label)
 
         self.material_selector_combo.currentIndexChanged.connect(self.select_objects_from_material)
-        self.refresh_materials_button.clicked.connect(self.populate_material_list)
+        self.material_selector_combo.aboutToShowPopup.connect(self._refresh_material_list_if_dirty)
+        self.refresh_materials_button.clicked.connect(self.refresh_material_list)
         self.assign_button.clicked.connect(self.process_selection)
 
         self.browse_button.clicked.connect(self.browse_for_path)
         self.custom_path_combo.lineEdit().editingFinished.connect(self.add_current_path_to_history)
-        self.custom_path_combo.currentTextChanged.connect(self.update_active_path_display)
+        self.custom_path_combo.currentTextChanged.connect(self._schedule_path_display)
+        self.custom_path_combo.aboutToShowPopup.connect(self._refresh_path_history_if_dirty)
+        self.custom_path_combo.currentTextChanged.connect(self.invalidate_texture_index)
         
         self.subdiv_slider.valueChanged.connect(self.update_subdiv_text)
         self.subdiv_line_edit.returnPressed.connect(self.update_subdiv_slider)
@@ -228,61 +480,227 @@ class MaterialTextureManagerWindow(MayaQWidgetBaseMixin, QtWidgets.QWidget):
 
     def start_selection_monitor(self):
         if not self.selection_script_job:
-            self.selection_script_job = mc.scriptJob(event=["SelectionChanged", self.update_selection_info], protected=True)
+            self.selection_script_job = mc.scriptJob(event=["SelectionChanged", self._schedule_update], protected=True)
+
+    def _schedule_update(self):
+        if self._is_updating_ui: return
+        self._update_timer.start(50)
 
     def stop_selection_monitor(self):
         if self.selection_script_job and mc.scriptJob(exists=self.selection_script_job):
             mc.scriptJob(kill=self.selection_script_job, force=True)
             self.selection_script_job = None
 
+    @contextlib.contextmanager
+    def _suspend_ui(self, chunk_name):
+        self._is_updating_ui = True
+        chunk_open = False
+        try:
+            mc.undoInfo(openChunk=True, chunkName=chunk_name)
+            chunk_open = True
+            mc.refresh(suspend=True)
+            yield
+        finally:
+            mc.refresh(suspend=False)
+            if chunk_open:
+                mc.undoInfo(closeChunk=True)
+            self._is_updating_ui = False
+
+    def register_scene_callbacks(self):
+        if self._callback_ids: return
+        self._callback_ids = [
+            om2.MSceneMessage.addCallback(om2.MSceneMessage.kAfterNew, self._on_scene_opened),
+            om2.MSceneMessage.addCallback(om2.MSceneMessage.kAfterOpen, self._on_scene_opened),
+            om2.MDGMessage.addNodeAddedCallback(self._on_shader_added, 'aiStandardSurface'),
+            om2.MDGMessage.addNodeRemovedCallback(self._on_shader_list_changed, 'aiStandardSurface'),
+            om2.MDGMessage.addNodeAddedCallback(self._watch_shading_engine, 'shadingEngine'),
+        ]
+        self._watch_scene_nodes()
+
+    def remove_scene_callbacks(self):
+        if self._callback_ids:
+            om2.MMessage.removeCallbacks(self._callback_ids)
+            self._callback_ids = []
+        self._remove_node_callbacks()
+
+    def _remove_node_callbacks(self):
+        if self._node_callback_ids:
+            om2.MMessage.removeCallbacks(self._node_callback_ids)
+            self._node_callback_ids = []
+
+    def _watch_scene_nodes(self):
+        self._remove_node_callbacks()
+        for fn_node in _iter_dependency_nodes(om2.MFn.kShadingEngine):
+            self._watch_shading_engine(fn_node.object())
+        for fn_node in _iter_dependency_nodes(om2.MFn.kPluginDependNode, 'aiStandardSurface'):
+            self._watch_shader(fn_node.object())
+
+    def _watch_shading_engine(self, node, *args):
+        self._node_callback_ids.append(om2.MNodeMessage.addAttributeChangedCallback(node, self._on_shading_engine_changed))
+
+    def _watch_shader(self, node):
+        self._node_callback_ids.append(om2.MNodeMessage.addNameChangedCallback(node, self._on_scene_edited))
+
+    def _on_scene_opened(self, *args):
+        self._watch_scene_nodes()
+        self._on_scene_reset()
+
+    def _on_scene_reset(self, *args):
+        self._shader_cache_sorted = None
+        self._material_list_dirty = True
+        self._shader_members_cache.clear()
+        self._selection_shader_cache.clear()
+
+    def _on_shader_added(self, node, *args):
+        self._watch_shader(node)
+        self._on_shader_list_changed()
+
+    def _on_shader_list_changed(self, *args):
+        self._shader_cache_sorted = None
+        self._material_list_dirty = True
+        self._selection_shader_cache.clear()
+
+    def _on_scene_edited(self, *args):
+        self._scene_caches_dirty = True
+
+    def _on_shading_engine_changed(self, msg, plug, other_plug, *args):
+        if not msg & (om2.MNodeMessage.kConnectionMade | om2.MNodeMessage.kConnectionBroken): return
+        if om2.MFnAttribute(plug.attribute()).name in SHADING_ENGINE_WATCH_ATTRS:
+            self._scene_caches_dirty = True
+
+    def _consume_scene_edits(self):
+        if not self._scene_caches_dirty: return
+        self._scene_caches_dirty = False
+        self._shader_members_cache.clear()
+        self._selection_shader_cache.clear()
+        self._shader_cache_sorted = None
+        self._material_list_dirty = True
+
+    def refresh_after_reopen(self):
+        self.register_scene_callbacks()
+        self.start_selection_monitor()
+        if not self.workspace_script_job:
+            self.workspace_script_job = mc.scriptJob(event=["workspaceChanged", self._on_workspace_changed], protected=True)
+
+        self._scene_caches_dirty = False
+        self._on_scene_reset()
+        self.invalidate_texture_index()
+        self._on_workspace_changed()
+        self.populate_material_list()
+        self.update_selection_info()
+
     def closeEvent(self, event):
+        self._save_path_history()
+        if self._prefetch_executor is not None:
+            self._prefetch_executor.shutdown(wait=False)
+            self._prefetch_executor = None
+        self._pending_dir_scans.clear()
+        if self._texture_check_signals is not None:
+            try:
+                self._texture_check_signals.finished.disconnect(self._apply_texture_reload)
+            except (RuntimeError, TypeError):
+                pass
+            self._texture_check_signals = None
+            self.reload_button.setEnabled(True)
+        self._update_timer.stop()
         self.stop_selection_monitor()
+        if self.workspace_script_job and mc.scriptJob(exists=self.workspace_script_job):
+            mc.scriptJob(kill=self.workspace_script_job, force=True)
+            self.workspace_script_job = None
+        self.remove_scene_callbacks()
         super(MaterialTextureManagerWindow, self).closeEvent(event)
 
     def update_selection_info(self):
         if self._is_updating_ui: return
         
         self._is_updating_ui = True
+        self._arnold_attr_cache.clear()
+        self._consume_scene_edits()
         try:
-            shader = self.get_shader_from_selection()
+            selection = mc.ls(selection=True, head=1, long=True)
+            shape_path = _get_mesh_shape_path(selection[0]) if selection else None
+            shape = shape_path.fullPathName() if shape_path else None
+            shader = self.get_shader_from_selection(selection, shape_path)
             
             if shader:
                 self.selected_material_label.setText(shader)
             else:
-                selection = mc.ls(selection=True, head=1)
                 self.selected_material_label.setText("マテリアルがありません" if selection else "オブジェクトを選択してください")
 
-            self.material_selector_combo.blockSignals(True)
-            if shader:
-                index = self.material_selector_combo.findText(shader)
-                if index != -1:
-                    self.material_selector_combo.setCurrentIndex(index)
-            else:
-                self.material_selector_combo.setCurrentIndex(0)
-            self.material_selector_combo.blockSignals(False)
-
-            self.update_arnold_attributes_ui()
-            self.update_connection_status_ui()
+            with _signals_blocked(self.material_selector_combo):
+                if shader:
+                    index = self._material_row_lookup.get(shader, -1)
+                    if index == -1 and self._material_list_dirty:
+                        self.populate_material_list()
+                        index = self._material_row_lookup.get(shader, -1)
+                    if index != -1:
+                        self.material_selector_combo.setCurrentIndex(index)
+                else:
+                    self.material_selector_combo.setCurrentIndex(0)
+
+            if self._pending_panel_refresh is None:
+                QtCore.QTimer.singleShot(0, self._flush_panel_refresh)
+            self._pending_panel_refresh = (shape, shader)
         finally:
             self._is_updating_ui = False
 
+    def _flush_panel_refresh(self):
+        if self._pending_panel_refresh is None: return
+        shape, shader = self._pending_panel_refresh
+        self._pending_panel_refresh = None
+        self._refresh_arnold_attributes(shape)
+        self._refresh_connection_status(shader)
+
+    def get_scene_shaders(self):
+        if self._shader_cache_sorted is None:
+            self._shader_cache_sorted = sorted(mc.ls(type='aiStandardSurface'))
+        return self._shader_cache_sorted
+
+    def refresh_material_list(self):
+        self._on_scene_reset()
+        self.populate_material_list()
+
+    def _refresh_material_list_if_dirty(self):
+        self._consume_scene_edits()
+        if self._material_list_dirty:
+            self.populate_material_list()
+
     def populate_material_list(self):
-        self.material_selector_combo.blockSignals(True)
-        current_selection = self.material_selector_combo.currentText()
-        self.material_selector_combo.clear()
-        
-        shaders = mc.ls(type='aiStandardSurface')
-        if not shaders:
-            self.material_selector_combo.addItem("シーンにマテリアルがありません")
-            self.material_selector_combo.setEnabled(False)
-        else:
-            self.material_selector_combo.addItems([""] + sorted(shaders)) 
-            self.material_selector_combo.setEnabled(True)
-            index = self.material_selector_combo.findText(current_selection)
-            if index != -1:
-                self.material_selector_combo.setCurrentIndex(index)
-                
-        self.material_selector_combo.blockSignals(False)
+        self._material_list_dirty = False
+        shaders = self.get_scene_shaders()
+        items = [""] + shaders if shaders else ["シーンにマテリアルがありません"]
+        self.material_selector_combo.setEnabled(bool(shaders))
+        if items == self._material_model.stringList():
+            return
+
+        with _signals_blocked(self.material_selector_combo):
+            current_selection = self.material_selector_combo.currentText()
+            if not self._update_material_rows(items):
+                self._material_model.setStringList(items)
+            self._material_row_lookup = {name: row for row, name in enumerate(items)} if shaders else {}
+            self.material_selector_combo.setCurrentIndex(self._material_row_lookup.get(current_selection, 0))
+
+    def _update_material_rows(self, items):
+        old_items = self._material_model.stringList()
+        if old_items[:1] != [""] or items[:1] != [""]:
+            return False
+        new_names, old_names = set(items), set(old_items)
+        removed_rows = [row for row, name in enumerate(old_items) if name not in new_names]
+        added_names = [name for name in items if name not in old_names]
+        if len(removed_rows) + len(added_names) > MATERIAL_LIST_DIFF_LIMIT:
+            return False
+
+        for row in reversed(removed_rows):
+            self._material_model.removeRows(row, 1)
+        for name in added_names:
+            row = bisect.bisect_left(self._material_model.stringList(), name, 1)
+            self._material_model.insertRows(row, 1)
+            self._material_model.setData(self._material_model.index(row), name)
+        return True
+
+    def _remove_materials_from_list(self, shaders_before, remaining):
+        self._shader_cache_sorted = [s for s in shaders_before if s in remaining]
+        self.populate_material_list()
 
     def select_objects_from_material(self):
         if self._is_updating_ui: return
@@ -294,109 +712,155 @@ class MaterialTextureManagerWindow(MayaQWidgetBaseMixin, QtWidgets.QWidget):
                 mc.select(clear=True)
                 return
 
-            sg_nodes = mc.listConnections(shader, type='shadingEngine')
-            if sg_nodes:
-                members = mc.sets(sg_nodes[0], q=True)
-                if members:
-                    transforms_to_select = []
-                    for member in members:
-                        if mc.nodeType(member) in ['mesh', 'nurbsSurface', 'subdiv']:
-                            parent = mc.listRelatives(member, parent=True, fullPath=True)
-                            if parent: transforms_to_select.append(parent[0])
-                        elif mc.nodeType(member) == 'transform':
-                            transforms_to_select.append(member)
-                    
-                    if transforms_to_select:
-                        mc.select(list(set(transforms_to_select)), replace=True)
-                    else:
-                        mc.select(clear=True)
+            self._consume_scene_edits()
+            if shader not in self._shader_members_cache:
+                self._shader_members_cache[shader] = self._get_member_transforms(shader)
+            transforms_to_select = self._shader_members_cache[shader]
+            if transforms_to_select is not None:
+                if transforms_to_select:
+                    mc.select(transforms_to_select, replace=True)
+                else:
+                    mc.select(clear=True)
         finally:
             self._is_updating_ui = False
-            mc.evalDeferred(self.update_selection_info)
+            self._schedule_update()
+
+    def _get_member_transforms(self, shader):
+        sg_nodes = mc.listConnections(shader, type='shadingEngine')
+        if not sg_nodes: return None
+        members = om2.MFnSet(_get_depend_node(sg_nodes[0])).getMembers(False)
+        if members.isEmpty(): return None
+
+        transforms = set()
+        member_iter = om2.MItSelectionList(members, om2.MFn.kDagNode)
+        while not member_iter.isDone():
+            dag_path = member_iter.getDagPath()
+            if dag_path.hasFn(om2.MFn.kMesh) or dag_path.hasFn(om2.MFn.kNurbsSurface) or dag_path.hasFn(om2.MFn.kSubdiv):
+                if dag_path.node().hasFn(om2.MFn.kShape): dag_path.pop()
+                transforms.add(dag_path.fullPathName())
+            elif dag_path.node().hasFn(om2.MFn.kTransform):
+                transforms.add(dag_path.fullPathName())
+            member_iter.next()
+        return list(transforms)
 
     def update_arnold_attributes_ui(self):
-        shape = self.get_selected_shape()
-        
-        has_subdiv = bool(shape and mc.attributeQuery('aiSubdivIterations', node=shape, exists=True))
+        self._refresh_arnold_attributes(self.get_selected_shape())
+
+    def _refresh_arnold_attributes(self, shape):
+        has_subdiv, current_iter = _fast_get(shape, 'aiSubdivIterations')
+        self._arnold_attr_cache[(shape, 'aiSubdivIterations')] = has_subdiv
         self.subdiv_slider.setEnabled(has_subdiv)
         self.subdiv_line_edit.setEnabled(has_subdiv)
         if has_subdiv:
-            current_iter = mc.getAttr(f"{shape}.aiSubdivIterations")
-            self.subdiv_slider.blockSignals(True)
-            self.subdiv_line_edit.blockSignals(True)
-            self.subdiv_slider.setValue(current_iter)
-            self.subdiv_line_edit.setText(str(current_iter))
-            self.subdiv_slider.blockSignals(False)
-            self.subdiv_line_edit.blockSignals(False)
+            with _signals_blocked(self.subdiv_slider, self.subdiv_line_edit):
+                self.subdiv_slider.setValue(current_iter)
+                self.subdiv_line_edit.setText(str(current_iter))
         else:
             self.subdiv_line_edit.setText("-")
 
-        has_disp = bool(shape and mc.attributeQuery('aiDispHeight', node=shape, exists=True))
+        has_disp, current_height = _fast_get(shape, 'aiDispHeight')
+        self._arnold_attr_cache[(shape, 'aiDispHeight')] = has_disp
         self.height_slider.setEnabled(has_disp)
         self.height_line_edit.setEnabled(has_disp)
         if has_disp:
-            current_height = mc.getAttr(f"{shape}.aiDispHeight")
-            self.height_slider.blockSignals(True)
-            self.height_line_edit.blockSignals(True)
-            self.height_slider.setValue(int(current_height * 100))
-            self.height_line_edit.setText(f"{current_height:.2f}")
-            self.height_slider.blockSignals(False)
-            self.height_line_edit.blockSignals(False)
+            with _signals_blocked(self.height_slider, self.height_line_edit):
+                self.height_slider.setValue(int(current_height * 100))
+                self.height_line_edit.setText(f"{current_height:.2f}")
         else:
             self.height_line_edit.setText("-")
 
     def update_connection_status_ui(self):
-        shader = self.get_shader_from_selection()
-        if not shader:
-            for tex_type, button in self.connection_buttons.items():
-                button.setText(f"{tex_type}: -")
-                button.setStyleSheet("")
-                button.setEnabled(False)
+        self._refresh_connection_status(self.get_shader_from_selection())
+
+    def _refresh_connection_status(self, shader):
+        connection_states = self._probe_connections(shader) if shader else None
+        if (shader, connection_states) == self._last_connection_status:
             return
+        self._last_connection_status = (shader, connection_states)
 
         for tex_type, button in self.connection_buttons.items():
-            is_connected = self._is_texture_connected(shader, tex_type)
-            button.setEnabled(True)
-            if is_connected:
-                button.setText(f"{tex_type}: ON")
-                button.setStyleSheet("background-color: #02B918; color: white;") 
+            if not shader:
+                state = "none"
             else:
-                button.setText(f"{tex_type}: OFF")
-                button.setStyleSheet("background-color: #6B7280; color: white;")
-
-    def get_selected_shape(self):
-        selection = mc.ls(selection=True, head=1)
+                state = "on" if connection_states.get(tex_type, False) else "off"
+            button.setText(self._connection_button_texts[tex_type][state])
+            self._set_button_state(button, state)
+            button.setEnabled(bool(shader))
+
+    def _set_button_state(self, button, state):
+        if button.property("state") == state: return
+        button.setProperty("state", state)
+        button.style().unpolish(button)
+        button.style().polish(button)
+
+    def get_selected_shape(self, selection=None):
+        if selection is None:
+            selection = mc.ls(selection=True, head=1)
         if not selection: return None
-        shapes = mc.listRelatives(selection[0], shapes=True, fullPath=True, type='mesh')
-        return shapes[0] if shapes else None
+        shape_path = _get_mesh_shape_path(selection[0])
+        return shape_path.fullPathName() if shape_path else None
 
-    def get_shader_from_selection(self):
-        shape = self.get_selected_shape()
-        if not shape: return None
-        sg_nodes = mc.listConnections(shape, type='shadingEngine')
-        if not sg_nodes: return None
-        shaders = mc.listConnections(f"{sg_nodes[0]}.surfaceShader")
-        if shaders: return shaders[0]
-        shaders = mc.listConnections(f"{sg_nodes[0]}.aiSurfaceShader")
-        return shaders[0] if shaders else None
+    def get_shader_from_selection(self, selection=None, shape_path=None):
+        if selection is None:
+            selection = mc.ls(selection=True, head=1, long=True)
+        if not selection: return None
+        self._consume_scene_edits()
+        sel_key = selection[0]
+        if sel_key in self._selection_shader_cache:
+            self._selection_shader_cache.move_to_end(sel_key)
+            return self._selection_shader_cache[sel_key]
+
+        shader = self._find_shader_for_node(sel_key, shape_path)
+        self._selection_shader_cache[sel_key] = shader
+        if len(self._selection_shader_cache) > SELECTION_SHADER_CACHE_SIZE:
+            self._selection_shader_cache.popitem(last=False)
+        return shader
+
+    def _find_shader_for_node(self, node, shape_path=None):
+        if shape_path is None:
+            shape_path = _get_mesh_shape_path(node)
+        if shape_path is None: return None
+        sg_node = _get_shading_engine(om2.MFnDependencyNode(shape_path.node()))
+        if sg_node is None: return None
+        sg_fn = om2.MFnDependencyNode(sg_node)
+        return _get_plug_source_name(sg_fn, 'surfaceShader') or _get_plug_source_name(sg_fn, 'aiSurfaceShader')
         
-    def _is_texture_connected(self, shader, tex_type):
-        full_attr = ""
-        if tex_type == "normal":
-            full_attr = f"{shader}.normalCamera"
-        elif tex_type == "displacement":
+    def _probe_connections(self, shader):
+        try:
+            shader_fn = om2.MFnDependencyNode(_get_depend_node(shader))
+        except RuntimeError:
+            return {}
+
+        connection_states = {}
+        for tex_type, attr_name in ATTR_FOR_TYPE.items():
+            try:
+                connection_states[tex_type] = shader_fn.findPlug(attr_name, False).isDestination
+            except RuntimeError:
+                connection_states[tex_type] = False
+
+        sg_node = _get_shading_engine(shader_fn)
+        connection_states["displacement"] = (
+            sg_node is not None and om2.MFnDependencyNode(sg_node).findPlug("displacementShader", False).isDestination
+        )
+        return connection_states
+
+    def _get_connection_attr(self, shader, tex_type):
+        if tex_type == "displacement":
             sg_nodes = mc.listConnections(shader, type='shadingEngine')
-            if not sg_nodes: return False
-            full_attr = f"{sg_nodes[0]}.displacementShader"
-        else:
-            attr_name = ATTRIBUTE_MAP.get(tex_type)
-            if not attr_name: return False
-            full_attr = f"{shader}.{attr_name}"
-        
-        return bool(mc.listConnections(full_attr, s=True, d=False))
+            return f"{sg_nodes[0]}.displacementShader" if sg_nodes else None
+        attr_name = ATTR_FOR_TYPE.get(tex_type)
+        return f"{shader}.{attr_name}" if attr_name else None
+
+    def _is_texture_connected(self, shader, tex_type):
+        full_attr = self._get_connection_attr(shader, tex_type)
+        if not full_attr: return False
+        return bool(mc.connectionInfo(full_attr, isDestination=True))
 
     def update_subdiv_text(self, value):
-        self.subdiv_line_edit.setText(str(value))
+        self._subdiv_text_timer.start()
+
+    def _flush_subdiv_text(self):
+        self.subdiv_line_edit.setText(str(self.subdiv_slider.value()))
 
     def update_subdiv_slider(self):
         try:
@@ -407,7 +871,10 @@ class MaterialTextureManagerWindow(MayaQWidgetBaseMixin, QtWidgets.QWidget):
             pass 
 
     def update_height_text(self, value):
-        self.height_line_edit.setText(f"{value / 100.0:.2f}")
+        self._height_text_timer.start()
+
+    def _flush_height_text(self):
+        self.height_line_edit.setText(f"{self.height_slider.value() / 100.0:.2f}")
 
     def update_height_slider(self):
         try:
@@ -418,16 +885,26 @@ class MaterialTextureManagerWindow(MayaQWidgetBaseMixin, QtWidgets.QWidget):
             pass 
 
 
+    def _has_arnold_attr(self, shape, attr):
+        if not shape: return False
+        cache_key = (shape, attr)
+        if cache_key not in self._arnold_attr_cache:
+            try:
+                self._arnold_attr_cache[cache_key] = om2.MFnDependencyNode(_get_depend_node(shape)).hasAttribute(attr)
+            except RuntimeError:
+                self._arnold_attr_cache[cache_key] = False
+        return self._arnold_attr_cache[cache_key]
+
     def apply_subdivision_iterations(self):
         value = self.subdiv_slider.value()
         shape = self.get_selected_shape()
-        if shape and mc.objExists(shape) and mc.attributeQuery('aiSubdivIterations', node=shape, exists=True):
+        if self._has_arnold_attr(shape, 'aiSubdivIterations'):
             mc.setAttr(f"{shape}.aiSubdivIterations", value)
 
     def apply_displacement_height(self):
         value = self.height_slider.value() / 100.0
         shape = self.get_selected_shape()
-        if shape and mc.objExists(shape) and mc.attributeQuery('aiDispHeight', node=shape, exists=True):
+        if self._has_arnold_attr(shape, 'aiDispHeight'):
             mc.setAttr(f"{shape}.aiDispHeight", value)
 
     def process_selection(self):
@@ -436,52 +913,67 @@ class MaterialTextureManagerWindow(MayaQWidgetBaseMixin, QtWidgets.QWidget):
             self.status_label.setText("<font color='red'>エラー: オブジェクトが選択されていません。</font>")
             return
 
-        valid_objects = [s for s in selection if mc.listRelatives(s, shapes=True, type='mesh', fullPath=True)]
+        mesh_shapes = mc.listRelatives(selection, shapes=True, type='mesh', fullPath=True) or []
+        mesh_parents = {shape.rsplit('|', 1)[0] for shape in mesh_shapes}
+        valid_objects = [s for s in selection if s in mesh_parents]
         if not valid_objects:
             self.status_label.setText("<font color='orange'>警告: ポリゴンメッシュが選択されていません。</font>")
             return
 
         self.status_label.setText("処理中...")
-        QtWidgets.QApplication.processEvents()
+        self.status_label.repaint()
 
-        created_count, assigned_count = 0, 0
+        material_groups = {}
         for obj_path in valid_objects:
-            obj_name = obj_path.split('|')[-1]
-            try:
-                is_created = self.create_and_assign_material(obj_path, obj_name)
-                if is_created: created_count += 1
-                else: assigned_count += 1
-            except Exception as e:
-                mc.warning(f"{obj_name} のマテリアル処理に失敗: {e}")
+            clean_name = _sanitize_name(obj_path.split('|')[-1])
+            material_groups.setdefault(clean_name, []).append(obj_path)
+
+        created_count, assigned_count = 0, 0
+        assigned_shaders = []
+        with self._suspend_ui("MaterialAssign"):
+            for clean_name, obj_paths in material_groups.items():
+                try:
+                    shader_node, is_created = self.create_and_assign_material(obj_paths, clean_name)
+                    assigned_shaders.append(shader_node)
+                    if is_created: created_count += 1
+                    assigned_count += len(obj_paths) - (1 if is_created else 0)
+                except Exception as e:
+                    mc.warning(f"{clean_name} のマテリアル処理に失敗: {e}")
+
+        self.prefetch_texture_dirs(assigned_shaders)
         
         self.status_label.setText(f"<font color='green'>成功: {created_count}個のマテリアルを作成, {assigned_count}個を割り当て。</font>")
-        self.populate_material_list()
+        self._material_list_dirty = True
         self.update_selection_info()
 
-    def create_and_assign_material(self, obj_path, obj_name):
-        clean_name = re.sub(r'[^a-zA-Z0-9_]', '_', obj_name)
+    def create_and_assign_material(self, obj_paths, clean_name):
         shader_name = f"{clean_name}_mat"
-        
-        if mc.objExists(shader_name) and mc.nodeType(shader_name) == 'aiStandardSurface':
-            shader_node = shader_name
-            is_new_material = False
-        else:
-            shader_node = mc.shadingNode('aiStandardSurface', asShader=True, name=shader_name)
-            is_new_material = True
-
-        sg_connections = mc.listConnections(shader_node, d=True, s=False, type="shadingEngine")
-        if sg_connections:
-            sg_node = sg_connections[0]
+        try:
+            shader_fn = om2.MFnDependencyNode(_get_depend_node(shader_name))
+        except RuntimeError:
+            shader_fn = None
+        is_new_material = shader_fn is None or shader_fn.typeName != 'aiStandardSurface'
+
+        sg_node = None if is_new_material else _get_shading_engine(shader_fn)
+        if sg_node is not None:
+            mc.sets(obj_paths, edit=True, forceElement=om2.MFnDependencyNode(sg_node).name())
+            return shader_name, is_new_material
+
+        if is_new_material:
+            edits = [f'string $shader = `shadingNode -asShader -name {_mel_quote(shader_name)} aiStandardSurface`;']
         else:
-            sg_node = mc.sets(renderable=True, noSurfaceShader=True, empty=True, name=f"{shader_node}SG")
-            mc.connectAttr(f'{shader_node}.outColor', f'{sg_node}.surfaceShader')
-        
-        mc.sets(obj_path, edit=True, forceElement=sg_node)
-        return is_new_material
+            edits = [f'string $shader = {_mel_quote(shader_name)};']
+        edits += [
+            'string $sg = `sets -renderable true -noSurfaceShader true -empty -name ($shader + "SG")`;',
+            'connectAttr ($shader + ".outColor") ($sg + ".surfaceShader");',
+            f'sets -edit -forceElement $sg {" ".join(_mel_quote(path) for path in obj_paths)};',
+        ]
+        mel.eval("{\n" + "\n".join(edits) + "\n}")
+        return self._find_shader_for_node(obj_paths[0]) or shader_name, is_new_material
 
     def toggle_texture_connection_by_type(self, tex_type):
         self.status_label.setText(f"'{tex_type}' 接続をトグル中...")
-        QtWidgets.QApplication.processEvents()
+        self.status_label.repaint()
         
         original_selection = mc.ls(sl=True, long=True)
         shader = self.get_shader_from_selection()
@@ -490,20 +982,21 @@ class MaterialTextureManagerWindow(MayaQWidgetBaseMixin, QtWidgets.QWidget):
             self.status_label.setText("<font color='orange'>操作対象のマテリアルがありません。</font>")
             return
 
-        if self._is_texture_connected(shader, tex_type):
-            self._cleanup_single_connection(shader, tex_type)
-        else:
-            if original_selection:
-                obj_path = original_selection[0]
-                material_name = shader 
-                self._connect_single_texture(shader, material_name, tex_type, obj_path)
+        with self._suspend_ui("ToggleTextureConnection"):
+            if self._is_texture_connected(shader, tex_type):
+                self._cleanup_single_connection(shader, tex_type)
             else:
-                self.status_label.setText("<font color='orange'>テクスチャ接続にはオブジェクトの選択が必要です。</font>")
+                if original_selection:
+                    obj_path = original_selection[0]
+                    material_name = shader 
+                    self._connect_single_texture(shader, material_name, tex_type, obj_path)
+                else:
+                    self.status_label.setText("<font color='orange'>テクスチャ接続にはオブジェクトの選択が必要です。</font>")
 
-        if original_selection:
-            mc.select(original_selection, replace=True)
+            if original_selection:
+                mc.select(original_selection, replace=True)
             
-        mc.evalDeferred(self.update_selection_info)
+        self._schedule_update()
         self.status_label.setText(f"<font color='blue'>{tex_type} 接続をトグルしました。</font>")
 
     def _connect_single_texture(self, shader_node, material_name, tex_type, obj_path):
@@ -524,135 +1017,230 @@ class MaterialTextureManagerWindow(MayaQWidgetBaseMixin, QtWidgets.QWidget):
         file_node, _ = self._create_texture_file_node(material_name, tex_type, texture_path)
         
         try:
+            edits = []
             if tex_type == "normal":
-                normal_map_node = mc.shadingNode('aiNormalMap', asUtility=True, name=f"{material_name}_NRM")
-                mc.connectAttr(f"{file_node}.outColor", f"{normal_map_node}.input")
-                mc.connectAttr(f"{normal_map_node}.outValue", f"{shader_node}.normalCamera")
+                edits += [
+                    f'string $nrm = `shadingNode -asUtility -name {_mel_quote(material_name + "_NRM")} aiNormalMap`;',
+                    f'connectAttr {_mel_quote(file_node + ".outColor")} ($nrm + ".input");',
+                    f'connectAttr ($nrm + ".outValue") {_mel_quote(shader_node + ".normalCamera")};',
+                ]
             elif tex_type == "displacement":
-                disp_shader_node = mc.shadingNode('displacementShader', asShader=True, name=f"{material_name}_DISP")
+                edits.append(f'string $disp = `shadingNode -asShader -name {_mel_quote(material_name + "_DISP")} displacementShader`;')
                 sg_nodes = mc.listConnections(shader_node, type='shadingEngine')
                 if sg_nodes:
-                    mc.connectAttr(f"{file_node}.outAlpha", f"{disp_shader_node}.displacement")
-                    mc.connectAttr(f"{disp_shader_node}.displacement", f"{sg_nodes[0]}.displacementShader")
+                    edits += [
+                        f'connectAttr {_mel_quote(file_node + ".outAlpha")} ($disp + ".displacement");',
+                        f'connectAttr ($disp + ".displacement") {_mel_quote(sg_nodes[0] + ".displacementShader")};',
+                    ]
                     shapes = mc.listRelatives(obj_path, shapes=True, fullPath=True, type='mesh')
                     if shapes:
-                        for shape in shapes:
-                            mc.setAttr(f"{shape}.aiSubdivType", 1) 
-            elif tex_type == "base_color":
-                mc.connectAttr(f"{file_node}.outColor", f"{shader_node}.{ATTRIBUTE_MAP[tex_type]}", force=True)
-            elif tex_type == "opacity":
-                mc.connectAttr(f"{file_node}.outColor", f"{shader_node}.{ATTRIBUTE_MAP[tex_type]}", force=True)
+                        edits += [f'setAttr {_mel_quote(shape + ".aiSubdivType")} 1;' for shape in shapes]
             else:
-                mc.connectAttr(f"{file_node}.outAlpha", f"{shader_node}.{ATTRIBUTE_MAP[tex_type]}", force=True)
+                out_attr = "outColor" if tex_type in ("base_color", "opacity") else "outAlpha"
+                edits.append(f'connectAttr -f {_mel_quote(f"{file_node}.{out_attr}")} {_mel_quote(f"{shader_node}.{ATTRIBUTE_MAP[tex_type]}")};')
+
+            mel.eval("{\n" + "\n".join(edits) + "\n}")
             
             print(f"接続成功: {texture_path} -> {shader_node}")
         except Exception as e:
             print(f"接続失敗: {file_node} -> {shader_node}: {e}")
 
     def _cleanup_single_connection(self, shader, tex_type):
-        full_attr = ""
-        if tex_type == "normal":
-            full_attr = f"{shader}.normalCamera"
-        elif tex_type == "displacement":
-            sg_nodes = mc.listConnections(shader, type='shadingEngine')
-            if sg_nodes: full_attr = f"{sg_nodes[0]}.displacementShader"
-            else: return
-        else:
-            attr_name = ATTRIBUTE_MAP.get(tex_type)
-            if not attr_name: return
-            full_attr = f"{shader}.{attr_name}"
+        full_attr = self._get_connection_attr(shader, tex_type)
+        if not full_attr: return
 
         source_node = mc.listConnections(full_attr, s=True, d=False, p=False)
         if source_node:
-            history = mc.listHistory(source_node[0])
-            nodes_to_delete = {node for node in history if mc.nodeType(node) in ['file', 'place2dTexture', 'aiNormalMap', 'bump2d', 'displacementShader']}
+            nodes_to_delete = set()
+            history_iter = om2.MItDependencyGraph(
+                _get_depend_node(source_node[0]), om2.MFn.kInvalid,
+                om2.MItDependencyGraph.kUpstream, om2.MItDependencyGraph.kDepthFirst, om2.MItDependencyGraph.kNodeLevel
+            )
+            is_root = True
+            while not history_iter.isDone():
+                node_fn = om2.MFnDependencyNode(history_iter.currentNode())
+                if node_fn.typeName in CLEANUP_NODE_TYPES:
+                    nodes_to_delete.add(node_fn.name())
+                elif not is_root:
+                    history_iter.prune()
+                is_root = False
+                history_iter.next()
             if nodes_to_delete:
                 mc.delete(list(nodes_to_delete))
 
     def _create_texture_file_node(self, material_name, tex_type, texture_path):
         file_node_name = f"{material_name}_{tex_type}_file"
         p2d_node_name = f"{material_name}_{tex_type}_p2d"
+        is_linear = tex_type in LINEAR_WORKFLOW_TYPES
+        color_space = "Raw" if is_linear else "sRGB"
+        is_udim = "<UDIM>" in texture_path
+
+        try:
+            _ensure_create_file_node_proc()
+        except RuntimeError as e:
+            mc.warning(f"MELプロシージャを定義できないため、Pythonでfileノードを作成します: {e}")
+        else:
+            args = ", ".join([
+                _mel_quote(file_node_name), _mel_quote(p2d_node_name), _mel_quote(texture_path),
+                _mel_quote(color_space), str(int(is_linear)), str(int(is_udim))
+            ])
+            file_node, p2d_node = mel.eval(f"{CREATE_FILE_NODE_MEL_PROC}({args})")
+            return file_node, p2d_node
 
         file_node = mc.shadingNode('file', asTexture=True, name=file_node_name, isColorManaged=True)
         p2d_node = mc.shadingNode('place2dTexture', asUtility=True, name=p2d_node_name)
         
-        mc.connectAttr(f'{p2d_node}.coverage', f'{file_node}.coverage', f=True)
-        mc.connectAttr(f'{p2d_node}.translateFrame', f'{file_node}.translateFrame', f=True)
-        mc.connectAttr(f'{p2d_node}.rotateFrame', f'{file_node}.rotateFrame', f=True)
-        mc.connectAttr(f'{p2d_node}.mirrorU', f'{file_node}.mirrorU', f=True)
-        mc.connectAttr(f'{p2d_node}.mirrorV', f'{file_node}.mirrorV', f=True)
-        mc.connectAttr(f'{p2d_node}.stagger', f'{file_node}.stagger', f=True)
-        mc.connectAttr(f'{p2d_node}.wrapU', f'{file_node}.wrapU', f=True)
-        mc.connectAttr(f'{p2d_node}.wrapV', f'{file_node}.wrapV', f=True)
-        mc.connectAttr(f'{p2d_node}.repeatUV', f'{file_node}.repeatUV', f=True)
-        mc.connectAttr(f'{p2d_node}.offset', f'{file_node}.offset', f=True)
-        mc.connectAttr(f'{p2d_node}.rotateUV', f'{file_node}.rotateUV', f=True)
-        mc.connectAttr(f'{p2d_node}.noiseUV', f'{file_node}.noiseUV', f=True)
-        mc.connectAttr(f'{p2d_node}.outUV', f'{file_node}.uvCoord', f=True)
-        mc.connectAttr(f'{p2d_node}.outUvFilterSize', f'{file_node}.uvFilterSize', f=True)
+        for src_attr, dst_attr in P2D_TO_FILE_ATTRS:
+            mc.connectAttr(f'{p2d_node}.{src_attr}', f'{file_node}.{dst_attr}', f=True)
         
         mc.setAttr(f"{file_node}.fileTextureName", texture_path, type="string")
 
-        if "<UDIM>" in texture_path:
+        if is_udim:
             mc.setAttr(f"{file_node}.uvTilingMode", 3)
 
-        if tex_type in LINEAR_WORKFLOW_TYPES:
-            mc.setAttr(f"{file_node}.colorSpace", "Raw", type="string")
-            mc.setAttr(f"{file_node}.alphaIsLuminance", True)
-        else: # base_color
-            mc.setAttr(f"{file_node}.colorSpace", "sRGB", type="string")
-            mc.setAttr(f"{file_node}.alphaIsLuminance", False)
+        if mc.getAttr(f"{file_node}.colorSpace") != color_space:
+            mc.setAttr(f"{file_node}.colorSpace", color_space, type="string")
+        if mc.getAttr(f"{file_node}.alphaIsLuminance") != is_linear:
+            mc.setAttr(f"{file_node}.alphaIsLuminance", is_linear)
 
         return file_node, p2d_node
 
     def get_texture_root_dir(self):
         custom_path = self.custom_path_combo.currentText()
+        if self._texture_root_cache[0] == custom_path:
+            return self._texture_root_cache[1]
+
+        root_dir = self._resolve_texture_root_dir(custom_path)
+        self._texture_root_cache = (custom_path, root_dir)
+        return root_dir
+
+    def _resolve_texture_root_dir(self, custom_path):
         if custom_path and custom_path != "[Default] Project's sourceimages" and os.path.isdir(custom_path):
             return custom_path.replace("\\", "/")
         
-        project_path = mc.workspace(q=True, rd=True)
-        source_images_folder = mc.workspace(fileRuleEntry='sourceImages')
-        return os.path.join(project_path, source_images_folder).replace("\\", "/")
+        if self._workspace_root_cache is None:
+            project_path = mc.workspace(q=True, rd=True)
+            source_images_folder = mc.workspace(fileRuleEntry='sourceImages')
+            self._workspace_root_cache = os.path.join(project_path, source_images_folder).replace("\\", "/")
+        return self._workspace_root_cache
+
+    def _on_workspace_changed(self):
+        self._workspace_root_cache = None
+        self._texture_root_cache = (None, None)
+        self.update_active_path_display()
         
+    def _schedule_path_display(self, *args):
+        self._path_display_timer.start()
+
     def update_active_path_display(self):
         active_path = self.get_texture_root_dir()
         self.active_path_label.setText(f"アクティブパス: {active_path}")
 
+    def invalidate_texture_index(self, *args):
+        self._texture_root_cache = (None, None)
+        self._pending_dir_scans.clear()
+        self._texture_index_cache.clear()
+        self._texture_match_cache.clear()
+
+    def _get_texture_index(self, root_dir):
+        root_key = _dir_key(root_dir)
+        try: root_mtime = os.stat(root_dir).st_mtime_ns
+        except OSError: return frozenset(), {}
+        cached = self._texture_index_cache.get(root_key)
+        if cached is not None and cached[0] == root_mtime:
+            return cached[1], cached[2]
+
+        subdirs, entries = set(), []
+        try:
+            with os.scandir(root_dir) as it:
+                for entry in it:
+                    if entry.is_dir(): subdirs.add(os.path.normcase(entry.name))
+                    elif entry.is_file(): entries.append((entry.name, entry.name.lower()))
+        except OSError:
+            return frozenset(), {}
+
+        index = {root_key: (root_mtime, entries)}
+        self._texture_index_cache[root_key] = (root_mtime, subdirs, index)
+        self._texture_match_cache.clear()
+        return subdirs, index
+
+    def _list_texture_dir(self, texture_dir):
+        _, index = self._get_texture_index(self.get_texture_root_dir())
+        dir_key = _dir_key(texture_dir)
+        try: dir_mtime = os.stat(texture_dir).st_mtime_ns
+        except OSError: return None
+        cached = index.get(dir_key)
+        if cached is not None and cached[0] == dir_mtime:
+            return cached[1]
+
+        pending_scan = self._pending_dir_scans.pop(dir_key, None)
+        scanned = pending_scan.result() if pending_scan is not None and pending_scan.done() else None
+        if scanned is None or scanned[0] != dir_mtime:
+            scanned = _scan_texture_dir(texture_dir)
+        if scanned is None: return None
+        index[dir_key] = scanned
+        self._texture_match_cache.pop(dir_key, None)
+        return scanned[1]
+
+    def prefetch_texture_dirs(self, material_names):
+        root_dir = self.get_texture_root_dir()
+        _, index = self._get_texture_index(root_dir)
+        texture_dirs = {_dir_key(d): d for d in (self._get_texture_directory(n) for n in material_names)}
+        pending = {key: d for key, d in texture_dirs.items() if key not in index and key not in self._pending_dir_scans}
+        if not pending: return
+
+        if self._prefetch_executor is None:
+            self._prefetch_executor = ThreadPoolExecutor(max_workers=4)
+        for dir_key, texture_dir in pending.items():
+            self._pending_dir_scans[dir_key] = self._prefetch_executor.submit(_scan_texture_dir, texture_dir)
+
     def _get_texture_directory(self, material_name):
         root_dir = self.get_texture_root_dir()
-        specific_texture_dir = os.path.join(root_dir, material_name)
-        if os.path.isdir(specific_texture_dir):
-            return specific_texture_dir
+        subdirs, _ = self._get_texture_index(root_dir)
+        if os.path.normcase(material_name) in subdirs:
+            return os.path.join(root_dir, material_name)
         
         base_name = material_name.rsplit('_', 1)[0]
-        base_texture_dir = os.path.join(root_dir, base_name)
-        if os.path.isdir(base_texture_dir):
-            return base_texture_dir
+        if os.path.normcase(base_name) in subdirs:
+            return os.path.join(root_dir, base_name)
             
         return root_dir
 
-    def find_texture_file(self, texture_dir, texture_type):
-        if not os.path.isdir(texture_dir): return None
-        
-        udim_pattern = re.compile(r'(.+?)[._](\d{4})\.(.+)$', re.IGNORECASE)
-        
-        try: filenames = os.listdir(texture_dir)
-        except OSError: return None
+    def _classify_texture_dir(self, texture_dir):
+        entries = self._list_texture_dir(texture_dir)
+        if entries is None: return None
+
+        dir_key = _dir_key(texture_dir)
+        matches = self._texture_match_cache.get(dir_key)
+        if matches is not None:
+            return matches
+
+        dir_prefix = texture_dir.replace("\\", "/").rstrip("/")
+        udim_matches, plain_matches = {}, {}
+        match_udim = UDIM_FILE_PATTERN.match
+        for filename, lower_name in entries:
+            if lower_name.rpartition('.')[2] not in TEXTURE_EXTENSIONS: continue
+            hit_types = [t for t in ALL_TEX_TYPES if t in lower_name and t not in udim_matches]
+            if not hit_types: continue
+
+            match = match_udim(filename)
+            if match:
+                base_name, _, ext = match.groups()
+                udim_path = f"{dir_prefix}/{base_name}.<UDIM>.{ext}"
+                for tex_type in hit_types: udim_matches[tex_type] = udim_path
+                if len(udim_matches) == len(ALL_TEX_TYPES): break
+            else:
+                file_path = f"{dir_prefix}/{filename}"
+                for tex_type in hit_types: plain_matches.setdefault(tex_type, file_path)
 
-        udim_sets = {}
-        for filename in filenames:
-            if texture_type.lower() in filename.lower():
-                match = udim_pattern.match(filename)
-                if match:
-                    base_name, _, ext = match.groups()
-                    udim_path = os.path.join(texture_dir, f"{base_name}.<UDIM>.{ext}").replace("\\", "/")
-                    return udim_path
-
-        for filename in filenames:
-            if texture_type.lower() in filename.lower():
-                 return os.path.join(texture_dir, filename).replace("\\", "/")
-                 
-        return None
+        matches = {**plain_matches, **udim_matches}
+        self._texture_match_cache[dir_key] = matches
+        return matches
+
+    def find_texture_file(self, texture_dir, texture_type):
+        matches = self._classify_texture_dir(texture_dir)
+        if matches is None: return None
+        return matches.get(texture_type)
 
     def browse_for_path(self):
         result = mc.fileDialog2(fileMode=3, dialogStyle=2, startingDirectory=self.get_texture_root_dir())
@@ -665,34 +1253,47 @@ class MaterialTextureManagerWindow(MayaQWidgetBaseMixin, QtWidgets.QWidget):
         if not (path_to_save and os.path.isdir(path_to_save)):
             return
         
-        saved_paths_str = mc.optionVar(q=OPTION_VAR_KEY) if mc.optionVar(exists=OPTION_VAR_KEY) else ""
-        saved_paths = saved_paths_str.split(';') if saved_paths_str else []
-        
-        if path_to_save in saved_paths:
-            saved_paths.remove(path_to_save)
-        saved_paths.insert(0, path_to_save) 
-        
-        mc.optionVar(stringValue=(OPTION_VAR_KEY, ';'.join(saved_paths[:20]))) 
-        self.load_saved_paths()
+        if self._path_history[:1] != [path_to_save]:
+            self._path_history = list(dict.fromkeys([path_to_save] + self._path_history))[:20]
+            self._path_history_modified = True
+            self._path_history_dirty = True
+            self._save_path_history()
         self.custom_path_combo.setCurrentText(path_to_save)
         self.status_label.setText("<font color='blue'>パスの履歴を更新しました。</font>")
 
-    def load_saved_paths(self):
-        self.custom_path_combo.blockSignals(True)
+    def _read_path_history(self):
+        settings = QtCore.QSettings(SETTINGS_ORGANIZATION, SETTINGS_APPLICATION)
+        if settings.contains(SETTINGS_HISTORY_KEY):
+            return [p for p in settings.value(SETTINGS_HISTORY_KEY, [], type=list) if p]
+
+        saved_paths = mc.optionVar(q=OPTION_VAR_KEY) or []
+        if isinstance(saved_paths, str):
+            saved_paths = saved_paths.split(';')
+        return [p for p in saved_paths if p] if isinstance(saved_paths, list) else []
+
+    def _save_path_history(self):
+        if not self._path_history_modified: return
+        settings = QtCore.QSettings(SETTINGS_ORGANIZATION, SETTINGS_APPLICATION)
+        settings.setValue(SETTINGS_HISTORY_KEY, self._path_history)
+        self._path_history_modified = False
+
+    def _refresh_path_history_if_dirty(self):
+        if not self._path_history_dirty: return
         current_text = self.custom_path_combo.currentText()
-        self.custom_path_combo.clear()
-        
-        self.custom_path_combo.addItem("[Default] Project's sourceimages")
+        self.load_saved_paths()
+        with _signals_blocked(self.custom_path_combo):
+            self.custom_path_combo.setCurrentText(current_text)
 
-        if mc.optionVar(exists=OPTION_VAR_KEY):
-            saved_paths = mc.optionVar(q=OPTION_VAR_KEY).split(';')
-            self.custom_path_combo.addItems([p for p in saved_paths if p])
-        
-        index = self.custom_path_combo.findText(current_text)
-        if index != -1: self.custom_path_combo.setCurrentIndex(index)
-        else: self.custom_path_combo.setCurrentIndex(0)
+    def load_saved_paths(self):
+        self._path_history_dirty = False
+        with _signals_blocked(self.custom_path_combo):
+            current_text = self.custom_path_combo.currentText()
+            
+            items = ["[Default] Project's sourceimages"] + self._path_history
+            self._path_model.setStringList(items)
+            self._path_index = {text: i for i, text in enumerate(items)}
+            self.custom_path_combo.setCurrentIndex(self._path_index.get(current_text, 0))
 
-        self.custom_path_combo.blockSignals(False)
         self.update_active_path_display()
         
     def set_default_subdivision(self):
@@ -702,30 +1303,31 @@ class MaterialTextureManagerWindow(MayaQWidgetBaseMixin, QtWidgets.QWidget):
             mc.warning("No objects selected.")
             return
 
-        meshes_found = False
+        shapes = mc.listRelatives(selected_objects, shapes=True, fullPath=True, type='mesh') or []
+        shapes = list(dict.fromkeys(shapes))
+        meshes_found = bool(shapes)
         processed_count = 0
-        for obj in selected_objects:
-            shapes = mc.listRelatives(obj, shapes=True, fullPath=True, type='mesh')
-            if not shapes:
-                continue
+        writes = []
+        for shape in shapes:
+            print(f"Applying subdivision settings to: {shape}")
+            
+            try:
+                fn_node = om2.MFnDependencyNode(_get_depend_node(shape))
+                for attr, value in DEFAULT_SUBDIV_SETTINGS:
+                    if not fn_node.hasAttribute(attr):
+                        mc.warning(f"{shape} に '{attr}' アトリビュートがありません。")
+                    elif fn_node.findPlug(attr, False).asInt() != value:
+                        writes.append((f"{shape}.{attr}", value, 'int'))
+                processed_count += 1
+            except Exception as e:
+                mc.warning(f"Failed to set subdivision for {shape}: {e}")
 
-            for shape in shapes:
-                meshes_found = True
-                print(f"Applying subdivision settings to: {shape}")
-                
-                try:
-                    if mc.attributeQuery('aiSubdivType', node=shape, exists=True):
-                        mc.setAttr(f"{shape}.aiSubdivType", 1)
-                    else:
-                        mc.warning(f"{shape} に 'aiSubdivType' アトリビュートがありません。")
-
-                    if mc.attributeQuery('aiSubdivIterations', node=shape, exists=True):
-                        mc.setAttr(f"{shape}.aiSubdivIterations", 2)
-                    else:
-                        mc.warning(f"{shape} に 'aiSubdivIterations' アトリビュートがありません。")
-                    processed_count += 1
-                except Exception as e:
-                    mc.warning(f"Failed to set subdivision for {shape}: {e}")
+        with self._suspend_ui("SetDefaultSubdivision"):
+            failed = _batched_set_attrs(writes)
+        failed_shapes = {writes[i][0].rsplit('.', 1)[0] for i in failed}
+        for shape in failed_shapes:
+            mc.warning(f"Failed to set subdivision for {shape}")
+        processed_count -= len(failed_shapes)
 
         if not meshes_found:
             self.status_label.setText("<font color='orange'>選択内にメッシュが見つかりません。</font>")
@@ -735,59 +1337,127 @@ class MaterialTextureManagerWindow(MayaQWidgetBaseMixin, QtWidgets.QWidget):
             self.update_arnold_attributes_ui()
             
     def toggle_all_normal_invert_y(self):
-        normal_nodes = mc.ls(type='aiNormalMap')
+        normal_nodes = list(_iter_dependency_nodes(om2.MFn.kPluginDependNode, 'aiNormalMap'))
         if not normal_nodes:
             self.status_label.setText("<font color='orange'>シーンにaiNormalMapノードがありません。</font>")
             return
         
-        toggled_count = 0
-        for node in normal_nodes:
+        current_values = {}
+        for fn_node in normal_nodes:
             try:
-                current_value = mc.getAttr(f"{node}.invertY")
-                mc.setAttr(f"{node}.invertY", not current_value)
-                toggled_count += 1
+                current_values[fn_node.name()] = fn_node.findPlug('invertY', False).asBool()
             except Exception as e:
-                mc.warning(f"{node}のInvert Yのトグルに失敗しました: {e}")
+                mc.warning(f"{fn_node.name()}のInvert Yのトグルに失敗しました: {e}")
+
+        writes = [(f"{node}.invertY", not current_value, 'bool') for node, current_value in current_values.items()]
+        with self._suspend_ui("ToggleNormalInvertY"):
+            failed = _batched_set_attrs(writes)
+        for i in failed:
+            mc.warning(f"{writes[i][0].rsplit('.', 1)[0]}のInvert Yのトグルに失敗しました。")
+        toggled_count = len(writes) - len(failed)
                 
         self.status_label.setText(f"<font color='green'>{toggled_count}個のaiNormalMapノードのInvert Yをトグルしました。</font>")
 
     def reload_all_textures(self):
-        file_nodes = mc.ls(type='file')
-        if not file_nodes:
+        self.invalidate_texture_index()
+        node_paths = [
+            (fn_node.name(), fn_node.findPlug('fileTextureName', False).asString())
+            for fn_node in _iter_dependency_nodes(om2.MFn.kFileTexture)
+        ]
+        if not node_paths:
             self.status_label.setText("<font color='orange'>シーンにfileノードがありません。</font>")
             return
-            
-        reloaded_count = 0
-        for node in file_nodes:
-            try:
-                mel.eval(f'AEfileTextureReloadCmd "{node}"')
-                reloaded_count += 1
-            except Exception as e:
-                mc.warning(f"テクスチャのリロードに失敗しました {node}: {e}")
+
+        self.reload_button.setEnabled(False)
+        self.status_label.setText("テクスチャファイルを確認中...")
+
+        check = TextureExistenceCheck(node_paths)
+        self._texture_check_signals = check.signals
+        check.signals.finished.connect(self._apply_texture_reload)
+        QtCore.QThreadPool.globalInstance().start(check)
+
+    def _apply_texture_reload(self, results):
+        self._texture_check_signals = None
+        if not self.isVisible(): return
+        self.reload_button.setEnabled(True)
+        file_entries = [entry for entry in results if entry[2] is not None]
+        missing = [(node, path) for node, path, mtime in results if mtime is None and path]
+        for node, path in missing:
+            mc.warning(f"テクスチャファイルが見つかりません {node}: {path}")
+        unchanged_count = 0
+        existing_nodes = set(mc.ls([node for node, _, _ in file_entries]) or []) if file_entries else set()
+        pending = []
+        for node, path, mtime in file_entries:
+            if node not in existing_nodes: continue
+            if mtime != -1 and self._texture_mtimes.get((node, path)) == mtime:
+                unchanged_count += 1
+                continue
+            pending.append((node, path, mtime))
+
+        with self._suspend_ui("ReloadTextures"):
+            failed = _batched_set_attrs([(f"{node}.fileTextureName", path, 'string') for node, path, _ in pending])
+            reloaded = [entry for i, entry in enumerate(pending) if i not in failed]
+            if reloaded:
+                mc.dgdirty([node for node, _, _ in reloaded])
+
+        for i in failed:
+            mc.warning(f"テクスチャのリロードに失敗しました {pending[i][0]}")
+        for node, path, mtime in reloaded:
+            self._texture_mtimes[(node, path)] = mtime
+        reloaded_count = len(reloaded)
                 
-        self.status_label.setText(f"<font color='green'>{reloaded_count}個のテクスチャをリロードしました。</font>")
+        missing_count = len(missing)
+        summary = f"{reloaded_count}個のテクスチャをリロードしました。"
+        if unchanged_count:
+            summary += f"({unchanged_count}個は変更なし)"
+        if missing_count:
+            self.status_label.setText(f"<font color='orange'>{summary}({missing_count}個のファイルが見つかりません)</font>")
+        else:
+            self.status_label.setText(f"<font color='green'>{summary}</font>")
         print(f"Reloaded {reloaded_count} textures.")
 
     def delete_unused_nodes(self):
+        if self._delete_unused_running: return
+        self._delete_unused_running = True
+        self.delete_unused_button.setEnabled(False)
         try:
-            mel.eval('hyperShadePanelMenuCommand("hyperShadePanel1", "deleteUnusedNodes");')
+            self._consume_scene_edits()
+            list_was_current = not self._material_list_dirty
+            shaders_before = list(self.get_scene_shaders())
+            with self._suspend_ui("DeleteUnusedNodes"):
+                mel.eval('MLdeleteUnused;')
             self.status_label.setText("<font color='green'>未使用ノードを削除しました。</font>")
             print("Deleted unused nodes.")
-            self.populate_material_list() 
+            remaining = set(mc.ls(shaders_before) or []) if shaders_before else set()
+            if list_was_current:
+                self._remove_materials_from_list(shaders_before, remaining)
         except Exception as e:
+            self._material_list_dirty = True
             self.status_label.setText("<font color='red'>未使用ノードの削除に失敗しました。</font>")
             mc.warning(f"Failed to delete unused nodes: {e}")
+        finally:
+            QtCore.QTimer.singleShot(0, self._finish_delete_unused)
+
+    def _finish_delete_unused(self):
+        self._delete_unused_running = False
+        self.delete_unused_button.setEnabled(True)
 
 material_manager_window_instance = None
 
 def show_material_manager_window():
     global material_manager_window_instance
     if material_manager_window_instance is not None:
+        from shiboken6 import isValid
         try:
-            material_manager_window_instance.close()
-            material_manager_window_instance.deleteLater()
+            if isValid(material_manager_window_instance):
+                if not material_manager_window_instance.isVisible():
+                    material_manager_window_instance.refresh_after_reopen()
+                material_manager_window_instance.show()
+                material_manager_window_instance.raise_()
+                material_manager_window_instance.activateWindow()
+                return material_manager_window_instance
         except Exception as e:
-            print(f"既存ウィンドウのクローズ中にエラーが発生: {e}")
+            print(f"既存ウィンドウの再表示中にエラーが発生: {e}")
     
     maya_main_window = get_maya_main_window()
     material_manager_window_instance = MaterialTextureManagerWindow(parent=maya_main_window)